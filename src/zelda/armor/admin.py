@@ -1,6 +1,8 @@
 from django.contrib import admin
 
 from zelda.armor.models import Armor, ArmorUpgradeCost
+from zelda.lib.admin import KeysetModelAdmin
+from zelda.lib.pagination import SEEK_KEYS
 from zelda.registration.admin import UserArmorInline
 
 
@@ -14,9 +16,9 @@ class ArmorAdmin(admin.ModelAdmin[Armor]):
 
 
 @admin.register(ArmorUpgradeCost)
-class ArmorUpgradeCostAdmin(admin.ModelAdmin[ArmorUpgradeCost]):
+class ArmorUpgradeCostAdmin(KeysetModelAdmin[ArmorUpgradeCost]):
     list_display = ("name", "armor", "armor_set")
-    ordering = ("id",)
+    ordering = SEEK_KEYS
     search_fields = ("armor__name",)
     list_filter = ("armor", "item_code")
 
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ArmorAppConfig(AppConfig):
     name = "zelda.armor"
     verbose_name = "Armor"
+
+    def ready(self) -> None:
+        from zelda.armor import signals  # noqa: F401
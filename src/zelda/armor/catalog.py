@@ -0,0 +1,160 @@
+import hashlib
+from dataclasses import dataclass
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+
+from zelda.armor.models import Armor, ArmorUpgradeCost
+from zelda.lib.costs import CostVector
+
+MAXED_OUT = "Maxed out"
+FREE_TO_UPGRADE = "Free to upgrade"
+NOTHING_REMAINING = CostVector()
+CATALOG_VERSION_KEY = "armor:catalog-version"
+
+
+@dataclass(frozen=True, slots=True)
+class ArmorEntry:
+    """
+    The upgrade path of a single armor
+
+    Both costs and tooltips are indexed by the first level that has
+    not been purchased yet, so that `remaining_costs[n]` holds the sum
+    of the costs of all the levels from `n` onwards.
+    """
+
+    id: int
+    name: str
+    max_level: int
+    remaining_costs: tuple[CostVector, ...]
+    tooltips: tuple[str, ...]
+
+    def remaining_cost(self, current_level: int) -> CostVector:
+        if current_level + 1 >= len(self.remaining_costs):
+            return NOTHING_REMAINING
+        return self.remaining_costs[current_level + 1]
+
+    def tooltip(self, current_level: int) -> str:
+        if current_level == self.max_level:
+            return MAXED_OUT
+        if current_level + 1 >= len(self.tooltips):
+            return FREE_TO_UPGRADE
+        return self.tooltips[current_level + 1]
+
+
+@dataclass(frozen=True, slots=True)
+class ArmorCatalog:
+    armor: tuple[ArmorEntry, ...]
+    version: str
+
+
+def _build_entry(armor: Armor) -> ArmorEntry:
+    costs_per_level: dict[int, list[ArmorUpgradeCost]] = {}
+    for cost in armor.costs.all():
+        costs_per_level.setdefault(cost.level, []).append(cost)
+    top_level = max([armor.max_level, *costs_per_level])
+
+    level_costs = [
+        CostVector.from_costs(
+            (cost.item_code, cost.quantity)
+            for cost in costs_per_level.get(level, [])
+            if not cost.free
+        )
+        for level in range(top_level + 1)
+    ]
+    tooltips: list[str] = [FREE_TO_UPGRADE]
+    level_tooltips: list[str] = []
+    for level in range(top_level, -1, -1):
+        if costs := costs_per_level.get(level, []):
+            level_tooltip = "".join(f" {cost.quantity}x {cost.item}" for cost in costs)
+            level_tooltips.insert(0, f"{level}: {level_tooltip.strip()}")
+        tooltips.append("&#10;".join(level_tooltips) or FREE_TO_UPGRADE)
+
+    return ArmorEntry(
+        id=armor.id,
+        name=armor.name,
+        max_level=armor.max_level,
+        remaining_costs=CostVector.suffix_sums(level_costs),
+        tooltips=tuple(reversed(tooltips)),
+    )
+
+
+class _ProcessCatalog:
+    """
+    The catalog of the process, along with the shared version it was built for
+
+    Both are kept in a single tuple, so that threads never see the catalog
+    of one version paired with another version.
+    """
+
+    def __init__(self) -> None:
+        self.current: tuple[str, ArmorCatalog] | None = None
+
+    def get(self, version: str) -> ArmorCatalog | None:
+        current = self.current
+        if current is None or current[0] != version:
+            return None
+        return current[1]
+
+
+_process_catalog = _ProcessCatalog()
+
+
+def build_catalog() -> ArmorCatalog:
+    costs = ArmorUpgradeCost.objects.order_by("level", "id")
+    armor = Armor.objects.in_display_order().prefetch_related(
+        Prefetch("costs", queryset=costs)
+    )
+    entries = tuple(_build_entry(armor) for armor in armor)
+    # the entries only hold plain data, so their repr describes them fully
+    version = hashlib.sha256(repr(entries).encode()).hexdigest()
+    return ArmorCatalog(armor=entries, version=version)
+
+
+def get_catalog_version() -> str:
+    version = cache.get_or_set(CATALOG_VERSION_KEY, lambda: uuid4().hex, timeout=None)
+    return str(version)
+
+
+async def aget_catalog_version() -> str:
+    version = await cache.aget_or_set(
+        CATALOG_VERSION_KEY, lambda: uuid4().hex, timeout=None
+    )
+    return str(version)
+
+
+def get_catalog() -> ArmorCatalog:
+    """
+    Get the armor catalog
+
+    The catalog is built once per process, for the catalog version that
+    is shared by all of them through the cache. Whenever an armor or an
+    upgrade cost changes, in any process, the version is bumped, and every
+    process rebuilds its catalog on its next call.
+    """
+    version = get_catalog_version()
+    if (catalog := _process_catalog.get(version)) is None:
+        catalog = build_catalog()
+        _process_catalog.current = version, catalog
+    return catalog
+
+
+async def aget_catalog() -> ArmorCatalog:
+    # only building the catalog needs a thread for the ORM
+    if (catalog := _process_catalog.get(await aget_catalog_version())) is not None:
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def invalidate_catalog() -> None:
+    cache.set(CATALOG_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_catalog_on_commit() -> None:
+    # bumping the version earlier would let other processes rebuild their
+    # catalog from the rows before the change
+    transaction.on_commit(invalidate_catalog)
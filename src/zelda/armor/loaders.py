@@ -0,0 +1,206 @@
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Self
+
+from django.conf import settings
+from django.db import transaction
+
+from zelda.armor.catalog import invalidate_catalog_on_commit
+from zelda.armor.models import Armor, ArmorUpgradeCost
+from zelda.lib.utils import hash_json
+
+ARMOR_DEFINITIONS = settings.PROJECT_DIR.joinpath(
+    "zelda", "armor", "data", "armor.json"
+)
+FAIRY_TAX = {
+    1: 10,
+    2: 50,
+    3: 200,
+    4: 500,
+}
+
+CostKey = tuple[int, str]
+
+
+@dataclass(frozen=True, slots=True)
+class ArmorDefinition:
+    name: str
+    set_code: str | None
+    body_part_code: str
+    max_level: int
+    costs: dict[CostKey, int]
+
+    @classmethod
+    def from_json(cls, name: str, data: dict[str, Any]) -> Self:
+        costs: dict[CostKey, int] = {}
+        for level, level_costs in enumerate(data["upgrades"]):
+            fairy_tax = (
+                {"RUPEE": FAIRY_TAX[level] + int(level_costs.get("RUPEE", 0))}
+                if level
+                else {}
+            )
+            for item_code, quantity in (level_costs | fairy_tax).items():
+                costs[level, item_code] = int(quantity)
+        return cls(
+            name=name,
+            set_code=data.get("set"),
+            body_part_code=data["body_part"],
+            max_level=len(data["upgrades"]) - 1,
+            costs=costs,
+        )
+
+    @property
+    def digest(self) -> str:
+        return hash_json(
+            {
+                "name": self.name,
+                "set_code": self.set_code,
+                "body_part_code": self.body_part_code,
+                "max_level": self.max_level,
+                "costs": sorted(
+                    [level, item_code, quantity]
+                    for (level, item_code), quantity in self.costs.items()
+                ),
+            }
+        )
+
+    def differs_from(self, armor: Armor) -> bool:
+        return (self.set_code, self.body_part_code, self.max_level, self.digest) != (
+            armor.set_code,
+            armor.body_part_code,
+            armor.max_level,
+            armor.digest,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LoadResult:
+    armor: int
+    costs: int
+    deleted_costs: int
+
+    def __str__(self) -> str:
+        return (
+            f"Upserted {self.armor} armor and {self.costs} upgrade costs, "
+            f"deleted {self.deleted_costs} upgrade costs"
+        )
+
+
+def read_armor_definitions(path: Path = ARMOR_DEFINITIONS) -> Iterator[ArmorDefinition]:
+    with path.open() as file:
+        data = json.load(file)
+
+    for name, armor_data in data.items():
+        yield ArmorDefinition.from_json(name, armor_data)
+
+
+def load_armor(definitions: list[ArmorDefinition]) -> LoadResult:
+    """
+    Bring the armor and their upgrade costs in sync with their definitions
+
+    Only the rows that are missing or that differ from their definition
+    are written, using one upsert per table, keyed by the unique
+    constraints of the models. Upgrade costs that are no longer part
+    of the definition of their armor are deleted. Armor that is not
+    defined is left alone, so that the levels of the users are kept.
+
+    Once the load commits, the catalog is rebuilt by every process.
+    """
+    with transaction.atomic():
+        existing_armor = {
+            armor.name: armor
+            for armor in Armor.objects.filter(
+                name__in=[definition.name for definition in definitions]
+            )
+        }
+        upserted_armor = [
+            Armor(
+                name=definition.name,
+                set_code=definition.set_code,
+                body_part_code=definition.body_part_code,
+                max_level=definition.max_level,
+                digest=definition.digest,
+            )
+            for definition in definitions
+            if definition.name not in existing_armor
+            or definition.differs_from(existing_armor[definition.name])
+        ]
+        if upserted_armor:
+            Armor.objects.bulk_create(
+                upserted_armor,
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=[
+                    "set_code",
+                    "body_part_code",
+                    "max_level",
+                    "digest",
+                    "updated_at",
+                ],
+            )
+        armor_ids = {armor.name: armor.id for armor in existing_armor.values()}
+        armor_ids.update({armor.name: armor.id for armor in upserted_armor})
+
+        existing_costs: dict[tuple[int, int, str], tuple[int, int]] = {
+            (armor_id, level, item_code): (cost_id, quantity)
+            for cost_id, armor_id, level, item_code, quantity in (
+                ArmorUpgradeCost.objects.filter(
+                    armor_id__in=armor_ids.values()
+                ).values_list("id", "armor_id", "level", "item_code", "quantity")
+            )
+        }
+        upserted_costs = []
+        for definition in definitions:
+            armor_id = armor_ids[definition.name]
+            for (level, item_code), quantity in definition.costs.items():
+                existing_cost = existing_costs.pop((armor_id, level, item_code), None)
+                if existing_cost is None or existing_cost[1] != quantity:
+                    upserted_costs.append(
+                        ArmorUpgradeCost(
+                            armor_id=armor_id,
+                            level=level,
+                            item_code=item_code,
+                            quantity=quantity,
+                        )
+                    )
+        if upserted_costs:
+            ArmorUpgradeCost.objects.bulk_create(
+                upserted_costs,
+                update_conflicts=True,
+                unique_fields=["armor", "level", "item_code"],
+                update_fields=["quantity", "updated_at"],
+            )
+        deleted_costs = [cost_id for cost_id, _ in existing_costs.values()]
+        if deleted_costs:
+            ArmorUpgradeCost.objects.filter(id__in=deleted_costs).delete()
+        invalidate_catalog_on_commit()
+
+    return LoadResult(
+        armor=len(upserted_armor),
+        costs=len(upserted_costs),
+        deleted_costs=len(deleted_costs),
+    )
+
+
+def sync_armor(definitions: list[ArmorDefinition]) -> LoadResult:
+    """
+    Load only the armor whose definition changed since it was last loaded
+
+    The digest of every definition is compared to the one stored with
+    the armor, so unchanged armor and its upgrade costs are not even read.
+    """
+    digests = dict(
+        Armor.objects.filter(
+            name__in=[definition.name for definition in definitions]
+        ).values_list("name", "digest")
+    )
+    changed = [
+        definition
+        for definition in definitions
+        if digests.get(definition.name) != definition.digest
+    ]
+    if not changed:
+        return LoadResult(armor=0, costs=0, deleted_costs=0)
+    return load_armor(changed)
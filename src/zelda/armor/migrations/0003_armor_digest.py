@@ -0,0 +1,49 @@
+import hashlib
+import json
+from collections import defaultdict
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def store_digests(apps: Apps, _schema_editor: BaseDatabaseSchemaEditor) -> None:
+    # a frozen copy of ArmorDefinition.digest, computed from the stored rows,
+    # so that syncarmor reloads any armor that differs from its definition
+    Armor = apps.get_model("armor", "Armor")
+    ArmorUpgradeCost = apps.get_model("armor", "ArmorUpgradeCost")
+
+    costs = defaultdict(list)
+    for armor_id, level, item_code, quantity in ArmorUpgradeCost.objects.values_list(
+        "armor_id", "level", "item_code", "quantity"
+    ):
+        costs[armor_id].append([level, item_code, quantity])
+
+    all_armor = list(Armor.objects.all())
+    for armor in all_armor:
+        data = {
+            "name": armor.name,
+            "set_code": armor.set_code,
+            "body_part_code": armor.body_part_code,
+            "max_level": armor.max_level,
+            "costs": sorted(costs[armor.id]),
+        }
+        armor.digest = hashlib.sha256(
+            json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+    Armor.objects.bulk_update(all_armor, ["digest"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("armor", "0002_add_armor"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="armor",
+            name="digest",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(store_digests, migrations.RunPython.noop),
+    ]
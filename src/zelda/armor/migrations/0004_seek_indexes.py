@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("armor", "0003_armor_digest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="armor",
+            index=models.Index(fields=["created_at", "id"], name="armor_armor_seek"),
+        ),
+        migrations.AddIndex(
+            model_name="armorupgradecost",
+            index=models.Index(
+                fields=["created_at", "id"], name="armor_armorupgradecost_seek"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userarmor",
+            index=models.Index(
+                fields=["created_at", "id"], name="armor_userarmor_seek"
+            ),
+        ),
+    ]
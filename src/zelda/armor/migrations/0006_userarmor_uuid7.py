@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+import zelda.lib.uuids
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("armor", "0005_unique_uuids"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userarmor",
+            name="uuid",
+            field=models.UUIDField(
+                default=zelda.lib.uuids.uuid7, editable=False, unique=True
+            ),
+        ),
+    ]
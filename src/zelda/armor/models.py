@@ -1,15 +1,48 @@
 from __future__ import annotations
 
-from functools import total_ordering
-from typing import Any, ClassVar
+from collections.abc import Iterable, Iterator
+from typing import Any, ClassVar, Literal, Self
 
 from django.db import models
+from django.db.models.functions import Collate, NullIf
+from django.db.models.lookups import Exact, In
 
+from zelda.armor.versions import bumping_progress
 from zelda.lib.choices import ArmorSet, BodyPart, Item
-from zelda.lib.models import BaseModel, ForeignKey
+from zelda.lib.models import BaseModel, BaseQuerySet, ForeignKey
+from zelda.lib.uuids import uuid7
 from zelda.registration.models import User
 
 
+class ArmorQuerySet(BaseQuerySet["Armor"]):
+    def in_display_order(self) -> Self:
+        """
+        Order the armor as it is displayed to the users
+
+        Armor that belongs to a set comes first, grouped by set, with the
+        head, body and legs pieces in that order. The rest of the armor
+        follows in alphabetical order. Strings are compared by code point,
+        regardless of the collation of the database.
+        """
+        body_part_rank = models.Case(
+            models.When(
+                models.Q(set_code__isnull=True) | models.Q(set_code=""),
+                then=models.Value(0),
+            ),
+            models.When(body_part_code=BodyPart.HEAD.key, then=models.Value(0)),
+            models.When(body_part_code=BodyPart.BODY.key, then=models.Value(1)),
+            default=models.Value(2),
+        )
+        return self.order_by(
+            Collate(NullIf("set_code", models.Value("")), "C").asc(nulls_last=True),
+            body_part_rank,
+            Collate("name", "C"),
+        )
+
+
+ArmorManager = models.Manager.from_queryset(ArmorQuerySet)
+
+
 class Armor(BaseModel):
     name = models.CharField(max_length=255, unique=True)
     set_code = models.CharField(
@@ -17,12 +50,14 @@ class Armor(BaseModel):
     )
     body_part_code = models.CharField(max_length=255, choices=BodyPart.choices())
     max_level = models.PositiveSmallIntegerField()
+    digest = models.CharField(max_length=64, blank=True, editable=False)
 
-    objects: ClassVar[models.Manager[Armor]]
+    # the mypy plugin defines the class that from_queryset creates
+    objects: ClassVar[ManagerFromArmorQuerySet[Armor]] = ArmorManager()  # noqa: F821
     costs: ClassVar[models.Manager[ArmorUpgradeCost]]
     user_levels: ClassVar[models.Manager[UserArmor]]
 
-    class Meta:
+    class Meta(BaseModel.Meta):
         constraints: ClassVar[list[models.UniqueConstraint]] = [
             models.UniqueConstraint(
                 fields=["set_code", "body_part_code"],
@@ -30,41 +65,6 @@ class Armor(BaseModel):
             ),
         ]
 
-    @total_ordering
-    class SortingKey:
-        def __init__(self, armor: Armor):
-            self.armor = armor
-
-        def __eq__(self, other: Any) -> bool:
-            if not isinstance(other, Armor.SortingKey):
-                return NotImplemented
-
-            return self.armor.id == other.armor.id
-
-        def __lt__(self, other: Any) -> bool:
-            if not isinstance(other, Armor.SortingKey):
-                return NotImplemented
-
-            if self.armor.id == other.armor.id:
-                return False
-
-            if self.armor.set_code and not other.armor.set_code:
-                return True
-
-            if not self.armor.set_code and other.armor.set_code:
-                return False
-
-            if not self.armor.set_code and not other.armor.set_code:
-                return self.armor.name < other.armor.name
-
-            if self.armor.set_code != other.armor.set_code:
-                return self.armor.set_code < other.armor.set_code  # type: ignore[operator]
-
-            return (
-                self.armor.body_part_code == BodyPart.HEAD.key
-                or other.armor.body_part_code == BodyPart.LEGS.key
-            )
-
     def __str__(self) -> str:
         return self.name
 
@@ -75,11 +75,11 @@ class Armor(BaseModel):
 
     @property
     def armor_set(self) -> str:
-        return ArmorSet[self.set_code].label if self.set_code else ""
+        return ArmorSet.label_for(self.set_code) if self.set_code else ""
 
     @property
     def body_part(self) -> str:
-        return BodyPart[self.body_part].label
+        return BodyPart.label_for(self.body_part_code)
 
 
 class ArmorUpgradeCost(BaseModel):
@@ -90,7 +90,7 @@ class ArmorUpgradeCost(BaseModel):
 
     objects: ClassVar[models.Manager[ArmorUpgradeCost]]
 
-    class Meta:
+    class Meta(BaseModel.Meta):
         constraints: ClassVar[list[models.UniqueConstraint]] = [
             models.UniqueConstraint(
                 fields=["armor", "level", "item_code"],
@@ -116,12 +116,101 @@ class ArmorUpgradeCost(BaseModel):
 
     @property
     def item(self) -> str:
-        return "" if self.free else Item[self.item_code].label
+        return "" if self.free else Item.label_for(self.item_code)
+
+
+class UserArmorQuerySet(BaseQuerySet["UserArmor"]):
+    """
+    Armor levels that bump the progress version of the users they change
+
+    Every write bumps each of its users once, when the transaction commits.
+    The users are read from the objects that are written, or from the
+    filters of the queryset when it is filtered by user, like the levels
+    of a user are, and they are only queried otherwise.
+    """
+
+    def _user_ids(self) -> set[int]:
+        where = self.query.where
+        if where.connector == "AND" and not where.negated:
+            children: list[object] = list(where.children)
+            for child in children:
+                if not isinstance(child, Exact | In):
+                    continue
+                if getattr(getattr(child.lhs, "target", None), "name", None) != "user":
+                    continue
+                values = child.rhs if isinstance(child, In) else [child.rhs]
+                if isinstance(values, list | tuple | set) and all(
+                    isinstance(value, int) for value in values
+                ):
+                    return set(values)
+        return set(self.order_by().values_list("user", flat=True).distinct())
+
+    @staticmethod
+    def _tracked(objs: Iterable[UserArmor], user_ids: set[int]) -> Iterator[UserArmor]:
+        for obj in objs:
+            user_ids.add(obj.user_id)
+            yield obj
+
+    def _untracked(self) -> BaseQuerySet[UserArmor]:
+        # the writes of the base queryset don't look the users up again
+        return BaseQuerySet(self.model, self.query.chain(), using=self.db)
+
+    def bulk_create(
+        self, objs: Iterable[UserArmor], *args: Any, **kwargs: Any
+    ) -> list[UserArmor]:
+        with bumping_progress() as user_ids:
+            return super().bulk_create(self._tracked(objs, user_ids), *args, **kwargs)
+
+    def bulk_insert(self, objs: Iterable[UserArmor], *args: Any, **kwargs: Any) -> int:
+        with bumping_progress() as user_ids:
+            return super().bulk_insert(self._tracked(objs, user_ids), *args, **kwargs)
+
+    def bulk_update(
+        self,
+        objs: Iterable[UserArmor],
+        fields: Iterable[str],
+        batch_size: int | None = None,
+        *,
+        strategy: Literal["case", "values"] = "case",
+    ) -> int:
+        with bumping_progress() as user_ids:
+            return self._untracked().bulk_update(
+                self._tracked(objs, user_ids), fields, batch_size, strategy=strategy
+            )
+
+    def bulk_apply(
+        self, operations: Iterable[tuple[models.Q | dict[str, Any], dict[str, Any]]]
+    ) -> int:
+        with bumping_progress():
+            return super().bulk_apply(operations)
+
+    def update(self, **kwargs: Any) -> int:
+        with bumping_progress() as user_ids:
+            user_ids.update(self._user_ids())
+            return super().update(**kwargs)
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        with bumping_progress() as user_ids:
+            user_ids.update(self._user_ids())
+            return super().delete()
+
+
+UserArmorManager = models.Manager.from_queryset(UserArmorQuerySet)
 
 
 class UserArmor(BaseModel):
+    # levels are inserted far more often than anything else
+    uuid = models.UUIDField(default=uuid7, editable=False, unique=True)
     user = ForeignKey(User, related_name="armor_levels")
     armor = ForeignKey(Armor, related_name="user_levels")
     level = models.PositiveSmallIntegerField()
 
-    objects: ClassVar[models.Manager[UserArmor]]
+    objects: ClassVar[ManagerFromUserArmorQuerySet[UserArmor]] = (  # noqa: F821
+        UserArmorManager()
+    )
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        # a post_delete receiver would stop querysets from deleting in bulk
+        with bumping_progress() as user_ids:
+            user_ids.add(self.user_id)
+            return super().delete(*args, **kwargs)
@@ -0,0 +1,188 @@
+import hashlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Literal, Self, TypedDict
+
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.http import quote_etag
+from django.utils.safestring import mark_safe
+
+from zelda.armor.catalog import ArmorCatalog, aget_catalog, get_catalog
+from zelda.armor.models import UserArmor
+from zelda.armor.versions import (
+    aget_progress_version,
+    bumping_progress,
+    get_progress_version,
+)
+from zelda.lib.costs import CostVector
+from zelda.registration.models import User
+
+PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+class UserArmorDict(TypedDict):
+    current_level: int | Literal[""]
+    max_level: int
+    tooltip: str
+
+
+@dataclass(frozen=True)
+class ArmorProgress:
+    user_armor: dict[str, UserArmorDict]
+    remaining_cost: dict[str, int]
+
+    @classmethod
+    def for_user(cls, user: User) -> Self:
+        current_levels = dict(user.armor_levels.values_list("armor", "level"))
+        return cls.from_levels(get_catalog(), current_levels)
+
+    @classmethod
+    async def afor_user(cls, user: User) -> Self:
+        current_levels = {
+            armor_id: level
+            async for armor_id, level in user.armor_levels.values_list("armor", "level")
+        }
+        return cls.from_levels(await aget_catalog(), current_levels)
+
+    @classmethod
+    def from_levels(
+        cls, catalog: ArmorCatalog, current_levels: Mapping[int, int]
+    ) -> Self:
+        remaining_costs: list[CostVector] = []
+        user_armor: dict[str, UserArmorDict] = {}
+        for armor in catalog.armor:
+            current_level = current_levels.get(armor.id, -1)
+            remaining_costs.append(armor.remaining_cost(current_level))
+            user_armor[armor.name] = {
+                "current_level": current_level if current_level >= 0 else "",
+                "max_level": armor.max_level,
+                "tooltip": mark_safe(armor.tooltip(current_level)),  # noqa: S308
+            }
+        return cls(
+            user_armor=user_armor,
+            remaining_cost=CostVector.sum(remaining_costs).to_dict(),
+        )
+
+    @classmethod
+    def cached_for_user(cls, user: User) -> Self:
+        """
+        Get the armor progress of a user, computing it only when it changed
+
+        The cache key contains the progress version of the user and the
+        version of the catalog, so stale entries are never read, and they
+        are left to expire.
+        """
+        version = get_progress_version(user.pk)
+        key = progress_key(user.pk, version, get_catalog())
+        progress: Self | None = cache.get(key)
+        if progress is None:
+            progress = cls.for_user(user)
+            cache.set(key, progress, timeout=PROGRESS_TIMEOUT)
+        return progress
+
+    @classmethod
+    async def acached_for_user(cls, user: User) -> Self:
+        version = await aget_progress_version(user.pk)
+        key = progress_key(user.pk, version, await aget_catalog())
+        progress: Self | None = await cache.aget(key)
+        if progress is None:
+            progress = await cls.afor_user(user)
+            await cache.aset(key, progress, timeout=PROGRESS_TIMEOUT)
+        return progress
+
+
+def progress_key(user_id: int, version: str, catalog: ArmorCatalog) -> str:
+    return f"armor:progress:{user_id}:{version}:{catalog.version}"
+
+
+def progress_etag(user: User) -> str:
+    """
+    Get a strong ETag for the armor progress of a user
+
+    Any change to the levels of the user either bumps the latest update
+    time or changes the number of levels, and any change to the armor
+    catalog changes its version.
+    """
+    levels = user.armor_levels.aggregate(
+        count=Count("id"), last_update=Max("updated_at")
+    )
+    last_update = levels["last_update"].isoformat() if levels["last_update"] else ""
+    state = f"{user.pk}:{levels['count']}:{last_update}:{get_catalog().version}"
+    return quote_etag(hashlib.sha256(state.encode()).hexdigest())
+
+
+@dataclass(frozen=True)
+class ArmorLevelDiff:
+    """
+    The changes needed to bring a user's armor levels to the requested ones
+
+    A requested level of -1 means that the armor is not purchased, and
+    its level row has to be removed.
+    """
+
+    user: User
+    created: list[UserArmor]
+    updated: list[UserArmor]
+    deleted: list[int]
+
+    @classmethod
+    def compute(cls, user: User, requested_levels: Mapping[int, int]) -> Self:
+        return cls.from_levels(user, user.armor_levels.all(), requested_levels)
+
+    @classmethod
+    async def acompute(cls, user: User, requested_levels: Mapping[int, int]) -> Self:
+        current = [user_armor async for user_armor in user.armor_levels.all()]
+        return cls.from_levels(user, current, requested_levels)
+
+    @classmethod
+    def from_levels(
+        cls,
+        user: User,
+        current: Iterable[UserArmor],
+        requested_levels: Mapping[int, int],
+    ) -> Self:
+        current_levels = {user_armor.armor_id: user_armor for user_armor in current}
+        created: list[UserArmor] = []
+        updated: list[UserArmor] = []
+        deleted: list[int] = []
+        for armor_id, new_level in requested_levels.items():
+            user_armor = current_levels.get(armor_id)
+            if user_armor is None:
+                if new_level != -1:
+                    created.append(
+                        UserArmor(user=user, armor_id=armor_id, level=new_level)
+                    )
+            elif new_level == -1:
+                deleted.append(armor_id)
+            elif new_level != user_armor.level:
+                user_armor.level = new_level
+                updated.append(user_armor)
+        return cls(user=user, created=created, updated=updated, deleted=deleted)
+
+    def __bool__(self) -> bool:
+        return bool(self.created or self.updated or self.deleted)
+
+    def apply(self) -> None:
+        """
+        Apply the diff with at most one statement per kind of change
+        """
+        with transaction.atomic(), bumping_progress():
+            if self.deleted:
+                UserArmor.objects.filter(
+                    user=self.user, armor_id__in=self.deleted
+                ).delete()
+            if self.created:
+                UserArmor.objects.bulk_create(self.created)
+            if self.updated:
+                UserArmor.objects.filter(user=self.user).bulk_apply(
+                    ({"armor_id": user_armor.armor_id}, {"level": user_armor.level})
+                    for user_armor in self.updated
+                )
+
+    async def aapply(self) -> None:
+        # django can't run transactions from async code yet
+        await sync_to_async(self.apply)()
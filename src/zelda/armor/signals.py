@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from zelda.armor.catalog import invalidate_catalog_on_commit
+from zelda.armor.models import Armor, ArmorUpgradeCost, UserArmor
+from zelda.armor.versions import bump_progress_version_on_commit
+
+
+@receiver(post_save, sender=Armor)
+@receiver(post_delete, sender=Armor)
+@receiver(post_save, sender=ArmorUpgradeCost)
+@receiver(post_delete, sender=ArmorUpgradeCost)
+def catalog_changed(**_kwargs: Any) -> None:
+    invalidate_catalog_on_commit()
+
+
+@receiver(post_save, sender=UserArmor)
+def progress_changed(instance: UserArmor, **_kwargs: Any) -> None:
+    bump_progress_version_on_commit(instance.user_id)
@@ -6,4 +6,5 @@ app_name = "armor"
 urlpatterns = [
     path("", views.ArmorView.as_view(), name="armor"),
     path("update-armor", views.UpdateArmorView.as_view(), name="update-armor"),
+    path("progress", views.ArmorProgressView.as_view(), name="progress"),
 ]
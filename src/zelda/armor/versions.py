@@ -0,0 +1,65 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+_changed_users: ContextVar[set[int] | None] = ContextVar("changed_users", default=None)
+
+
+def progress_version_key(user_id: int) -> str:
+    return f"armor:progress-version:{user_id}"
+
+
+def get_progress_version(user_id: int) -> str:
+    version = cache.get_or_set(
+        progress_version_key(user_id), lambda: uuid4().hex, timeout=None
+    )
+    return str(version)
+
+
+async def aget_progress_version(user_id: int) -> str:
+    version = await cache.aget_or_set(
+        progress_version_key(user_id), lambda: uuid4().hex, timeout=None
+    )
+    return str(version)
+
+
+def bump_progress_versions(user_ids: Iterable[int]) -> None:
+    cache.set_many(
+        {progress_version_key(user_id): uuid4().hex for user_id in user_ids},
+        timeout=None,
+    )
+
+
+def bump_progress_version(user_id: int) -> None:
+    bump_progress_versions([user_id])
+
+
+def bump_progress_version_on_commit(user_id: int) -> None:
+    transaction.on_commit(partial(bump_progress_version, user_id))
+
+
+@contextmanager
+def bumping_progress() -> Iterator[set[int]]:
+    """
+    Bump the progress version of the users added to the set, once the block commits
+
+    Nested blocks add their users to the outermost one, so that every user
+    is bumped once, no matter how many writes change their levels.
+    """
+    if (user_ids := _changed_users.get()) is not None:
+        yield user_ids
+        return
+
+    user_ids = set()
+    token = _changed_users.set(user_ids)
+    try:
+        yield user_ids
+    finally:
+        _changed_users.reset(token)
+    if user_ids:
+        transaction.on_commit(partial(bump_progress_versions, user_ids))
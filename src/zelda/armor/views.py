@@ -1,93 +1,83 @@
-from typing import Any, Literal, TypedDict
+from http import HTTPStatus
+from typing import Any
 
 from django.http.request import HttpRequest
-from django.http.response import HttpResponse
+from django.http.response import HttpResponse, JsonResponse
 from django.shortcuts import redirect
-from django.utils.safestring import mark_safe
-from django.views.generic import TemplateView
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views import View
 
-from zelda.armor.models import Armor, UserArmor
-from zelda.lib.choices import Item
-from zelda.lib.views import BaseView, LoginRequiredError
+from zelda.armor.catalog import aget_catalog
+from zelda.armor.progress import ArmorLevelDiff, ArmorProgress, progress_etag
+from zelda.lib.views import AsyncBaseView, LoginRequiredError, auser
 
 
-class UserArmorDict(TypedDict):
-    current_level: int | Literal[""]
-    max_level: int
-    tooltip: str
-
-
-class ArmorView(BaseView):
+class ArmorView(AsyncBaseView):
     template_name = "armor/armor.html"
+    jinja2_template_name = "armor/armor.jinja"
+    query_budget = 5
 
-    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:  # noqa: ARG002
+    async def aget_context_data(self, **kwargs: Any) -> dict[str, Any]:  # noqa: ARG002
         user = self.request.user
         if user.is_anonymous:
             msg = "User must be logged in to view armor"
             raise LoginRequiredError(msg)
 
-        current_levels = dict(user.armor_levels.values_list("armor", "level"))
-        remaining_cost = {item: 0 for item in Item.labels()}
-        user_armor: dict[str, UserArmorDict] = {}
+        progress = await ArmorProgress.acached_for_user(user)
         hide_maxed_out = self.request.COOKIES.get("hideMaxedOut", "true") == "true"
-        for armor in sorted(
-            Armor.objects.prefetch_related("costs"), key=Armor.SortingKey
-        ):
-            current_level = current_levels.get(armor.id, -1)
-            tooltip_info: dict[int, str] = {}
-            for cost in armor.costs.filter(level__gt=current_level):
-                remaining_cost[cost.item] += cost.quantity
-                tooltip_info.setdefault(cost.level, "")
-                tooltip_info[cost.level] += f" {cost.quantity}x {cost.item}"
-            if armor.max_level == current_level:
-                tooltip = "Maxed out"
-            elif tooltip_info:
-                tooltip = "&#10;".join(
-                    f"{level}: {level_tooltip.strip()}"
-                    for level, level_tooltip in tooltip_info.items()
-                )
-            else:
-                tooltip = "Free to upgrade"
-            user_armor[armor.name] = {
-                "current_level": current_level if current_level >= 0 else "",
-                "max_level": armor.max_level,
-                "tooltip": mark_safe(tooltip),  # noqa: S308
-            }
         return {
-            "user_armor": user_armor,
-            "remaining_cost": remaining_cost,
+            "user_armor": progress.user_armor,
+            "remaining_cost": progress.remaining_cost,
             "hide_maxed_out": hide_maxed_out,
         }
 
 
-class UpdateArmorView(TemplateView):
+class ArmorProgressView(View):
+    query_budget = 6
+
     @staticmethod
-    def post(request: HttpRequest, *_args: Any, **_kwargs: Any) -> HttpResponse:
+    def get(request: HttpRequest, *_args: Any, **_kwargs: Any) -> HttpResponse:
+        user = request.user
+        if user.is_anonymous:
+            return JsonResponse(
+                {"detail": "User must be logged in to view armor"},
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+
+        etag = progress_etag(user)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            progress = ArmorProgress.cached_for_user(user)
+            response = JsonResponse(
+                {
+                    "user_armor": progress.user_armor,
+                    "remaining_cost": progress.remaining_cost,
+                }
+            )
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class UpdateArmorView(View):
+    query_budget = 11
+
+    @staticmethod
+    async def post(request: HttpRequest, *_args: Any, **_kwargs: Any) -> HttpResponse:
+        await auser(request)
         user = request.user
         if user.is_anonymous:
             msg = "User must be logged in to update armor"
             raise LoginRequiredError(msg)
 
         data = request.POST
-        current_levels = dict(user.armor_levels.values_list("armor", "level"))
-        update_armor: dict[int, int] = {}
-
-        for armor in Armor.objects.prefetch_related("user_levels"):
-            current_level = current_levels.get(armor.id, -1)
-            new_level = (
+        requested_levels = {
+            armor.id: (
                 -1 if (new_data := data.get(armor.name, "-1")) == "" else int(new_data)
             )
-            if new_level != current_level:
-                update_armor[armor.id] = new_level
-
-        for armor_id, new_level in update_armor.items():
-            if new_level == -1:
-                UserArmor.objects.filter(user=user, armor_id=armor_id).delete()
-            elif current_levels.get(armor_id, -1) == -1:
-                UserArmor.objects.create(user=user, armor_id=armor_id, level=new_level)
-            else:
-                UserArmor.objects.filter(user=user, armor_id=armor_id).update(
-                    level=new_level
-                )
+            for armor in (await aget_catalog()).armor
+        }
+        if diff := await ArmorLevelDiff.acompute(user, requested_levels):
+            await diff.aapply()
 
         return redirect("armor:armor")
@@ -1,3 +1,5 @@
 from django.core.asgi import get_asgi_application
 
-application = get_asgi_application()
+from zelda.lib.lifespan import LifespanApplication
+
+application = LifespanApplication(get_asgi_application())
@@ -0,0 +1,35 @@
+from time import perf_counter
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError
+
+from zelda.lib.warmup import iter_templates
+
+
+class Command(BaseCommand):
+    help = "Compile every template, failing if any of them has an error"
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        errors: list[str] = []
+        compiled = 0
+        start = perf_counter()
+        for engine, name in iter_templates():
+            template_start = perf_counter()
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as exc:
+                errors.append(f"{engine.name}: {name}: {exc}")
+                continue
+            compiled += 1
+            if options["verbosity"] >= 2:
+                duration = (perf_counter() - template_start) * 1000
+                self.stdout.write(f"{engine.name}: {name} in {duration:.1f}ms")
+
+        if errors:
+            raise CommandError("\n".join(errors))
+        if options["verbosity"] >= 1:
+            duration = (perf_counter() - start) * 1000
+            self.stdout.write(
+                self.style.SUCCESS(f"Compiled {compiled} templates in {duration:.1f}ms")
+            )
@@ -0,0 +1,23 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from zelda.armor.loaders import ARMOR_DEFINITIONS, load_armor, read_armor_definitions
+
+
+class Command(BaseCommand):
+    help = "Load the armor catalog from its definitions"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--path",
+            type=Path,
+            default=ARMOR_DEFINITIONS,
+            help="The JSON file with the armor definitions",
+        )
+
+    def handle(self, *_args: Any, **options: Any) -> None:
+        result = load_armor(list(read_armor_definitions(options["path"])))
+        if options["verbosity"] >= 1:
+            self.stdout.write(self.style.SUCCESS(str(result)))
@@ -0,0 +1,81 @@
+from typing import Any, TypeVar
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.db import models
+from django.http import HttpRequest
+
+from zelda.lib.pagination import InvalidCursorError, KeysetPaginator
+
+_M = TypeVar("_M", bound=models.Model)
+
+CURSOR_VAR = "cursor"
+
+
+class KeysetChangeList(ChangeList):
+    """
+    A change list that pages through the results with cursors
+
+    Every page seeks past the last row of the previous one, so deep pages
+    cost the same as the first one, as long as the ordering matches an
+    index. Instead of page numbers, there are links to the first and the
+    next page. Orderings that can't be seeked and editable lists fall back
+    to numbered pages.
+    """
+
+    cursor: str | None
+    keyset_pagination: bool
+    first_page_url: str | None
+    next_page_url: str | None
+
+    def __init__(self, request: HttpRequest, *args: Any, **kwargs: Any) -> None:
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.keyset_pagination = False
+        self.first_page_url = None
+        self.next_page_url = None
+        super().__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params: Any = None) -> dict[str, Any]:
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_results(self, request: HttpRequest) -> None:
+        super().get_results(request)
+        if (
+            not isinstance(self.paginator, KeysetPaginator)
+            or self.paginator.keys is None
+            or self.list_editable
+            or not self.multi_page
+            or (self.show_all and self.can_show_all)
+        ):
+            return
+
+        try:
+            page = self.paginator.page_after(self.cursor)
+        except InvalidCursorError as exc:
+            raise IncorrectLookupParameters from exc
+        self.keyset_pagination = True
+        self.result_list = page.object_list
+        if self.cursor is not None:
+            self.first_page_url = self.get_query_string(remove=[CURSOR_VAR])
+        if page.next_cursor is not None:
+            self.next_page_url = self.get_query_string({CURSOR_VAR: page.next_cursor})
+
+
+class KeysetModelAdmin(admin.ModelAdmin[_M]):
+    """
+    A model admin that pages through its change list with cursors
+
+    The ordering of the admin should match an index, like the one on
+    `SEEK_KEYS`, for the pages to seek through it.
+    """
+
+    paginator = KeysetPaginator
+    change_list_template = "admin/keyset_change_list.html"
+
+    def get_changelist(
+        self, request: HttpRequest, **kwargs: Any  # noqa: ARG002
+    ) -> type[ChangeList]:
+        return KeysetChangeList
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LibAppConfig(AppConfig):
     name = "zelda.lib"
     verbose_name = "Lib"
+
+    def ready(self) -> None:
+        from zelda.lib import signals  # noqa: F401
@@ -0,0 +1,92 @@
+from threading import Lock
+from typing import Any, ClassVar
+
+from psycopg import Connection, IsolationLevel
+from psycopg_pool import ConnectionPool
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    A PostgreSQL backend that borrows its connections from a pool
+
+    Setting OPTIONS["pool"] to the keyword arguments of a psycopg pool
+    makes every connection come from a pool that is shared by all the
+    threads of the process, so the threads that async views hand sync
+    code to borrow a connection for the request and return it when django
+    closes it at the end of the request. Without it, this is the plain
+    PostgreSQL backend.
+    """
+
+    _pools: ClassVar[dict[str, ConnectionPool[Any]]] = {}
+    _pools_lock = Lock()
+
+    def __init__(self, settings_dict: dict[str, Any], *args: Any, **kwargs: Any):
+        super().__init__(settings_dict, *args, **kwargs)
+        if self.pool_options and settings_dict["CONN_MAX_AGE"]:
+            msg = "Pooled connections can't be persistent, set CONN_MAX_AGE to 0"
+            raise ImproperlyConfigured(msg)
+
+    @property
+    def pool_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = self.settings_dict["OPTIONS"].get("pool") or {}
+        return options
+
+    @property
+    def pool(self) -> ConnectionPool[Any] | None:
+        if not self.pool_options:
+            return None
+
+        with self._pools_lock:
+            if self.alias not in self._pools:
+                pool: ConnectionPool[Any] = ConnectionPool(
+                    kwargs=self.get_connection_params(),
+                    open=False,
+                    check=(
+                        ConnectionPool.check_connection
+                        if self.settings_dict["CONN_HEALTH_CHECKS"]
+                        else None
+                    ),
+                    name=f"zelda-{self.alias}",
+                    **self.pool_options,
+                )
+                pool.open()
+                self._pools[self.alias] = pool
+            return self._pools[self.alias]
+
+    def close_pool(self) -> None:
+        with self._pools_lock:
+            if (pool := self._pools.pop(self.alias, None)) is not None:
+                pool.close()
+
+    def get_connection_params(self) -> dict[str, Any]:
+        conn_params: dict[str, Any] = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Connection[Any]:
+        if (pool := self.pool) is None:
+            connection: Connection[Any] = super().get_new_connection(conn_params)
+            return connection
+
+        connection = pool.getconn()
+        # the isolation level of the options is set on checkout, as the
+        # connection may have been used by a different wrapper before
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get(
+                "isolation_level", IsolationLevel.READ_COMMITTED
+            )
+        )
+        connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is None or self.pool is None:
+            super()._close()  # type: ignore[misc]
+            return
+
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
+            self.connection = None
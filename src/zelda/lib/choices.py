@@ -1,7 +1,8 @@
-from collections.abc import Iterator
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
-from enum import Enum, auto
+from enum import Enum, EnumType, auto
 from secrets import choice
+from types import MappingProxyType
 from typing import Any, Self
 
 
@@ -12,7 +13,55 @@ class ChoiceValue:
     obj: Any
 
 
-class Choices(Enum):
+@dataclass(frozen=True, slots=True)
+class ChoicesTable:
+    members: tuple[Any, ...]
+    choices: tuple[tuple[str, str], ...]
+    keys: tuple[str, ...]
+    labels: tuple[str, ...]
+    label_by_key: Mapping[str, str]
+    key_by_label: Mapping[str, str]
+    index_by_key: Mapping[str, int]
+
+    @classmethod
+    def from_members(cls, members: tuple[Any, ...]) -> Self:
+        return cls(
+            members=members,
+            choices=tuple((member.key, member.label) for member in members),
+            keys=tuple(member.key for member in members),
+            labels=tuple(member.label for member in members),
+            label_by_key=MappingProxyType(
+                {member.key: member.label for member in members}
+            ),
+            key_by_label=MappingProxyType(
+                {member.label: member.key for member in members}
+            ),
+            index_by_key=MappingProxyType(
+                {member.key: index for index, member in enumerate(members)}
+            ),
+        )
+
+
+_TABLES: dict[type, ChoicesTable] = {}
+
+
+class ChoicesType(EnumType):
+    """
+    Metaclass that precomputes the lookup tables of the choices
+
+    The tables are built once, when the class is created, so that
+    lookups by key or label don't need to iterate over the members.
+    """
+
+    def __new__(
+        cls, name: str, bases: tuple[type, ...], classdict: Any, **kwds: Any
+    ) -> "ChoicesType":
+        enum_class = super().__new__(cls, name, bases, classdict, **kwds)
+        _TABLES[enum_class] = ChoicesTable.from_members(tuple(enum_class))
+        return enum_class
+
+
+class Choices(Enum, metaclass=ChoicesType):
     @staticmethod
     def _generate_next_value_(
         name: str, _start: int, _count: int, _last_values: list[ChoiceValue]
@@ -25,13 +74,18 @@ class Choices(Enum):
         self.label = value.label
         self.obj = value.obj
 
+    @classmethod
+    def _table(cls) -> ChoicesTable:
+        return _TABLES[cls]
+
     @classmethod
     def random(cls) -> Self:
-        return choice(list(cls))
+        member: Self = choice(cls._table().members)
+        return member
 
     @classmethod
-    def choices(cls) -> list[tuple[str, str]]:
-        return [(item.key, item.label) for item in cls]
+    def choices(cls) -> tuple[tuple[str, str], ...]:
+        return cls._table().choices
 
     @classmethod
     def names(cls) -> Iterator[str]:
@@ -44,20 +98,30 @@ class Choices(Enum):
             yield item.value
 
     @classmethod
-    def keys(cls) -> Iterator[str]:
-        for item in cls:
-            yield item.key
+    def keys(cls) -> tuple[str, ...]:
+        return cls._table().keys
 
     @classmethod
-    def labels(cls) -> Iterator[str]:
-        for item in cls:
-            yield item.label
+    def labels(cls) -> tuple[str, ...]:
+        return cls._table().labels
 
     @classmethod
     def objects(cls) -> Iterator[Any]:
         for item in cls:
             yield item.obj
 
+    @classmethod
+    def label_for(cls, key: str) -> str:
+        return cls._table().label_by_key[key]
+
+    @classmethod
+    def key_for(cls, label: str) -> str:
+        return cls._table().key_by_label[label]
+
+    @classmethod
+    def index_of(cls, key: str) -> int:
+        return cls._table().index_by_key[key]
+
 
 class BodyPart(Choices):
     HEAD = auto()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from operator import add, sub
+from typing import Any
+
+from zelda.lib.choices import Item
+
+TYPECODE = "I"
+
+
+class CostVector:
+    """
+    An immutable quantity of every item
+
+    The quantities are stored in a compact array, indexed by the position
+    of the item in `Item`, so that vectors can be added column-wise
+    without hashing any item names. Quantities can't be negative, so
+    subtracting a larger vector raises an OverflowError.
+    """
+
+    __slots__ = ("_quantities",)
+
+    def __init__(self, quantities: Iterable[int] | None = None):
+        if quantities is None:
+            self._quantities = array(TYPECODE, [0]) * len(Item.keys())
+        else:
+            self._quantities = array(TYPECODE, quantities)
+        if len(self._quantities) != len(Item.keys()):
+            msg = f"Expected {len(Item.keys())} quantities, got {len(self._quantities)}"
+            raise ValueError(msg)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CostVector):
+            return NotImplemented
+        return self._quantities == other._quantities
+
+    def __hash__(self) -> int:
+        return hash(self._quantities.tobytes())
+
+    def __bool__(self) -> bool:
+        return any(self._quantities)
+
+    def __len__(self) -> int:
+        return len(self._quantities)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._quantities)
+
+    def __getitem__(self, item_code: str) -> int:
+        return self._quantities[Item.index_of(item_code)]
+
+    def __add__(self, other: CostVector) -> CostVector:
+        return CostVector(map(add, self._quantities, other._quantities))
+
+    def __sub__(self, other: CostVector) -> CostVector:
+        return CostVector(map(sub, self._quantities, other._quantities))
+
+    @classmethod
+    def from_costs(cls, costs: Iterable[tuple[str, int]]) -> CostVector:
+        quantities = [0] * len(Item.keys())
+        for item_code, quantity in costs:
+            quantities[Item.index_of(item_code)] += quantity
+        return cls(quantities)
+
+    @classmethod
+    def sum(cls, vectors: Iterable[CostVector]) -> CostVector:
+        rows = list(vectors)
+        if not rows:
+            return cls()
+        return cls(map(sum, zip(*rows, strict=True)))
+
+    @classmethod
+    def suffix_sums(cls, vectors: Sequence[CostVector]) -> tuple[CostVector, ...]:
+        """
+        Get the sums of all the vectors from every position onwards
+
+        The n-th element of the result is the sum of `vectors[n:]`, so
+        for per-level costs it is the cost of all the levels above n-1.
+        The result has one more element than the input, for the empty sum.
+        """
+        sums = [cls()]
+        for vector in reversed(vectors):
+            sums.append(sums[-1] + vector)
+        return tuple(reversed(sums))
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """
+        Iterate over the labels and quantities of the items that are needed
+        """
+        for label, quantity in zip(Item.labels(), self._quantities, strict=True):
+            if quantity:
+                yield label, quantity
+
+    def to_dict(self) -> dict[str, int]:
+        return dict(zip(Item.labels(), self._quantities, strict=True))
@@ -17,7 +17,7 @@ def get_timezones() -> set[str]:
 
 
 def now(tz_info: ZoneInfo = UTC) -> datetime:
-    return datetime.now(UTC).astimezone(tz_info)
+    return datetime.now(tz_info)
 
 
 def from_iso(date_string: str, tz_info: tzinfo = UTC) -> datetime:
@@ -0,0 +1,56 @@
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from django.db import connections
+
+from zelda.lib.warmup import warm_up
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[Mapping[str, Any]]]
+Send = Callable[[Mapping[str, Any]], Awaitable[None]]
+Application = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def close_databases() -> None:
+    for connection in connections.all():
+        connection.close()
+        if (close_pool := getattr(connection, "close_pool", None)) is not None:
+            close_pool()
+
+
+class LifespanApplication:
+    """
+    An ASGI application that warms up before serving, and cleans up after
+
+    Django can't handle the lifespan protocol, so its messages are handled
+    here and everything else is passed to the application. The server only
+    accepts requests once the startup is complete, so a worker reports
+    ready only when it is warm, and it doesn't start at all if warming up
+    fails.
+    """
+
+    def __init__(self, application: Application):
+        self.application = application
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "lifespan":
+            await self.application(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await sync_to_async(warm_up)()
+                except Exception as exc:  # noqa: BLE001
+                    await send(
+                        {"type": "lifespan.startup.failed", "message": repr(exc)}
+                    )
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await sync_to_async(close_databases)()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
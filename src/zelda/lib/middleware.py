@@ -0,0 +1,267 @@
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from secrets import SystemRandom
+from time import perf_counter
+from typing import Any, cast
+from urllib.parse import urlparse
+
+from asgiref.sync import (
+    async_to_sync,
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from whitenoise import middleware as whitenoise
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.urls import get_script_prefix
+
+from zelda.lib.models import identity_map
+from zelda.lib.rendering import render_timings
+
+logger = logging.getLogger(__name__)
+REPEATED_QUERY = "Query ran %s times in %s, possibly an N+1: %s"
+OVER_BUDGET = "%s ran %s queries, over its budget of %s"
+
+_random = SystemRandom()
+_query_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+GetResponse = Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]]
+
+
+class QueryBudgetExceededError(RuntimeError):
+    pass
+
+
+class AsyncMiddleware(ABC):
+    """
+    A middleware that is called asynchronously when the handler is async
+
+    Middleware that can only be called synchronously holds a thread for
+    as long as the rest of the request takes, even in front of async
+    views. Subclasses implement both call and __acall__ instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: GetResponse):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.call(request)
+
+    @abstractmethod
+    def call(self, request: HttpRequest) -> HttpResponse: ...
+
+    @abstractmethod
+    async def __acall__(self, request: HttpRequest) -> HttpResponse: ...
+
+    def get_sync_response(self, request: HttpRequest) -> HttpResponse:
+        return cast(HttpResponse, self.get_response(request))
+
+    async def get_async_response(self, request: HttpRequest) -> HttpResponse:
+        return await cast(Awaitable[HttpResponse], self.get_response(request))
+
+
+class IdentityMapMiddleware(AsyncMiddleware):
+    """
+    Fetch every object that is looked up by uuid at most once per request
+    """
+
+    def call(self, request: HttpRequest) -> HttpResponse:
+        with identity_map():
+            return self.get_sync_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        with identity_map():
+            return await self.get_async_response(request)
+
+
+class WhiteNoiseMiddleware(AsyncMiddleware):
+    """
+    Serve the static files with whitenoise, passing the rest through
+
+    Whitenoise can only be called synchronously, so only the requests for
+    static files go through it, from a thread, and the other requests stay
+    async. Files outside of STATIC_URL, like the ones of WHITENOISE_ROOT,
+    are only served to sync requests.
+    """
+
+    def __init__(self, get_response: GetResponse):
+        super().__init__(get_response)
+        self.whitenoise = whitenoise.WhiteNoiseMiddleware(self.call_through)
+        self.static_prefix = urlparse(settings.STATIC_URL or "").path
+        script_prefix = get_script_prefix().rstrip("/")
+        if script_prefix and self.static_prefix.startswith(script_prefix):
+            self.static_prefix = self.static_prefix[len(script_prefix) :]
+
+    def call(self, request: HttpRequest) -> HttpResponse:
+        return cast(HttpResponse, self.whitenoise(request))
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not request.path_info.startswith(self.static_prefix):
+            return await self.get_async_response(request)
+        return cast(HttpResponse, await sync_to_async(self.whitenoise)(request))
+
+    def call_through(self, request: HttpRequest) -> HttpResponse:
+        # whitenoise calls this from the thread of an async request, for
+        # the paths under STATIC_URL that are not static files
+        if iscoroutinefunction(self.get_response):
+            return async_to_sync(self.get_async_response)(request)
+        return self.get_sync_response(request)
+
+
+@dataclass
+class QueryStats:
+    budget: int | None = None
+    count: int = 0
+    duration: float = 0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,  # noqa: FBT001
+        context: dict[str, Any],
+    ) -> Any:
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+            # the parameters are passed separately, so the statement
+            # is the same for every row of an N+1
+            self.fingerprints[sql] += 1
+
+
+def record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,  # noqa: FBT001
+    context: dict[str, Any],
+) -> Any:
+    """
+    Count the query for the sampled request that runs it, if any
+
+    The wrapper is installed on every connection as it is created, since
+    the connections belong to the threads that run the queries, which for
+    async views are not the thread of the request.
+    """
+    if (stats := _query_stats.get()) is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+class QueryInstrumentationMiddleware(AsyncMiddleware):
+    """
+    Count and time the queries and templates of a sample of the requests
+
+    The query totals and the render time of every template are sent in the
+    Server-Timing header, statements that run too many times are logged,
+    and so are views that run more queries than their query_budget
+    attribute allows. With QUERY_BUDGET_STRICT, which the tests enable,
+    going over budget raises an error instead.
+    """
+
+    process_view: Callable[
+        [HttpRequest, Callable[..., HttpResponseBase], Any, Any],
+        Awaitable[None] | None,
+    ]
+
+    def __init__(self, get_response: GetResponse):
+        super().__init__(get_response)
+        # django would call a sync process_view from a thread for async requests
+        if iscoroutinefunction(self.get_response):
+            self.process_view = self.aset_budget
+        else:
+            self.process_view = self.set_budget
+
+    def call(self, request: HttpRequest) -> HttpResponse:
+        if _random.random() >= settings.QUERY_SAMPLE_RATE:
+            return self.get_sync_response(request)
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        try:
+            with render_timings() as renders:
+                response = self.get_sync_response(request)
+        finally:
+            _query_stats.reset(token)
+
+        self.report(request, response, stats, renders)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if _random.random() >= settings.QUERY_SAMPLE_RATE:
+            return await self.get_async_response(request)
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        try:
+            with render_timings() as renders:
+                response = await self.get_async_response(request)
+        finally:
+            _query_stats.reset(token)
+
+        self.report(request, response, stats, renders)
+        return response
+
+    @staticmethod
+    def set_budget(
+        _request: HttpRequest,
+        view_func: Callable[..., HttpResponseBase],
+        _view_args: Any,
+        _view_kwargs: Any,
+    ) -> None:
+        if (stats := _query_stats.get()) is not None:
+            view = getattr(view_func, "view_class", view_func)
+            stats.budget = getattr(view, "query_budget", None)
+
+    async def aset_budget(
+        self,
+        request: HttpRequest,
+        view_func: Callable[..., HttpResponseBase],
+        view_args: Any,
+        view_kwargs: Any,
+    ) -> None:
+        self.set_budget(request, view_func, view_args, view_kwargs)
+
+    @staticmethod
+    def report(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: QueryStats,
+        renders: list[tuple[str, float]],
+    ) -> None:
+        timings = [f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"']
+        timings.extend(
+            f'render;dur={duration * 1000:.1f};desc="{name}"'
+            for name, duration in renders
+        )
+        if server_timing := response.headers.get("Server-Timing"):
+            timings.insert(0, server_timing)
+        response.headers["Server-Timing"] = ", ".join(timings)
+
+        for sql, count in stats.fingerprints.items():
+            if count >= settings.QUERY_REPEAT_THRESHOLD:
+                logger.warning(REPEATED_QUERY, count, request.path, sql)
+
+        if stats.budget is not None and stats.count > stats.budget:
+            if settings.QUERY_BUDGET_STRICT:
+                msg = OVER_BUDGET % (request.path, stats.count, stats.budget)
+                raise QueryBudgetExceededError(msg)
+            logger.warning(OVER_BUDGET, request.path, stats.count, stats.budget)
@@ -1,16 +1,108 @@
-from collections.abc import Collection, Iterable
-from typing import Any, ClassVar, Self, TypeVar, cast
-from uuid import uuid4
+from collections.abc import Collection, Hashable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import reduce
+from itertools import batched
+from operator import itemgetter, or_
+from secrets import SystemRandom, randbelow
+from typing import Any, ClassVar, Literal, Self, TypeVar, cast
+from uuid import UUID, uuid4
 
-from django.db import models
+from asgiref.sync import sync_to_async
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    NotSupportedError,
+    connections,
+    models,
+    transaction,
+)
+from django.db.models import Max, Min
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.query import ModelIterable
 
 from zelda.lib.date_utils import now
+from zelda.lib.pagination import SEEK_KEYS, decode_cursor, nullable_keys, seek_filter
 from zelda.lib.types import OnDeleteType
 
 _T_co = TypeVar("_T_co", bound=models.Model, covariant=True)
 _ST = TypeVar("_ST")
 _GT = TypeVar("_GT")
 
+BULK_BATCH_SIZE = 1000
+STREAM_CHUNK_SIZE = 2000
+QUERY_PARAMS_LIMIT = 65535
+RANDOM_SORT_LIMIT = 1000
+RANDOM_ATTEMPTS = 5
+RANDOM_ESTIMATE_TIMEOUT = 60 * 10
+
+_identity_map: ContextVar[dict[tuple[type[models.Model], UUID], Any] | None] = (
+    ContextVar("identity_map", default=None)
+)
+
+
+@contextmanager
+def identity_map() -> Iterator[None]:
+    """
+    Share the objects looked up by uuid until the end of the block
+
+    Inside the block, every object is fetched at most once by get_by_uuid
+    and in_bulk_by_uuid, so it should only wrap short units of work, like
+    a single request.
+    """
+    token = _identity_map.set({})
+    try:
+        yield
+    finally:
+        _identity_map.reset(token)
+
+
+def _fold_key(changes: dict[str, Any]) -> Hashable:
+    key = tuple(sorted(changes.items(), key=itemgetter(0)))
+    try:
+        hash(key)
+    except TypeError:
+        # a key of its own, which nothing else is folded with
+        return object()
+    return key
+
+
+def _case_value(value: Any, field: models.Field[Any, Any]) -> Any:
+    # When would take a string for a field name
+    if hasattr(value, "resolve_expression"):
+        return value
+    return models.Value(value, output_field=field)
+
+
+def _joins(model: type[models.Model], condition: models.Q) -> bool:
+    # whether the filter needs a join, which a CASE in an UPDATE can't have
+    for child in condition.children:
+        if isinstance(child, models.Q):
+            if _joins(model, child):
+                return True
+            continue
+        lookup, _value = cast(tuple[str, Any], child)
+        name, *rest = lookup.split(LOOKUP_SEP)
+        try:
+            field = model._meta.get_field(name)  # noqa: SLF001
+        except FieldDoesNotExist:
+            continue
+        if not field.is_relation:
+            continue
+        if not field.concrete or field.many_to_many:
+            return True
+        related: type[models.Model] | str | None = field.related_model
+        if rest and isinstance(related, type):
+            try:
+                related._meta.get_field(rest[0])  # noqa: SLF001
+            except FieldDoesNotExist:
+                # a lookup on the foreign key itself
+                continue
+            return True
+    return False
+
 
 class ForeignKey(models.ForeignKey[_ST, _GT]):
     def __init__(
@@ -50,6 +142,33 @@ class OneToOneField(models.OneToOneField[_ST, _GT]):
 
 
 class BaseQuerySet(models.QuerySet[_T_co]):
+    """
+    A queryset with bulk, random, keyset and identity mapped helpers
+
+    Like the ones of django, the async counterparts of the helpers that
+    query run them in a thread. The abulk_create and aupdate of django
+    already call the overrides below, and flat_values is lazy, so it can
+    be iterated with async for.
+    """
+
+    @staticmethod
+    def _stamped_batches(
+        objs: Iterable[_T_co], batch_size: int | None, *, created: bool
+    ) -> Iterator[list[_T_co]]:
+        """
+        Split the objects in batches, stamping each batch as it is consumed
+
+        All the objects get the same timestamp, no matter how many batches
+        they are split into.
+        """
+        dt = now()
+        for batch in batched(objs, batch_size or BULK_BATCH_SIZE):
+            for obj in batch:
+                obj.updated_at = dt  # type: ignore[attr-defined]
+                if created:
+                    obj.created_at = dt  # type: ignore[attr-defined]
+            yield list(batch)
+
     def bulk_create(
         self,
         objs: Iterable[_T_co],
@@ -59,17 +178,55 @@ class BaseQuerySet(models.QuerySet[_T_co]):
         update_fields: Collection[str] | None = None,
         unique_fields: Collection[str] | None = None,
     ) -> list[_T_co]:
-        dt = now()
-        for obj in objs:
-            obj.updated_at = dt  # type: ignore[attr-defined]
-            obj.created_at = dt  # type: ignore[attr-defined]
-        return super().bulk_create(
-            objs,
-            batch_size,
-            ignore_conflicts,
-            update_conflicts,
-            update_fields,
-            unique_fields,
+        """
+        Insert the objects in batches of batch_size
+
+        Any iterable is accepted, and it is consumed one batch at a time,
+        but the created objects are all returned. Use bulk_insert to keep
+        the memory constant when the objects are not needed afterwards.
+        """
+        created: list[_T_co] = []
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in self._stamped_batches(objs, batch_size, created=True):
+                created.extend(
+                    super().bulk_create(
+                        batch,
+                        batch_size,
+                        ignore_conflicts,
+                        update_conflicts,
+                        update_fields,
+                        unique_fields,
+                    )
+                )
+        return created
+
+    def bulk_insert(
+        self,
+        objs: Iterable[_T_co],
+        batch_size: int | None = None,
+        ignore_conflicts: bool = False,  # noqa: FBT001,FBT002
+    ) -> int:
+        """
+        Insert the objects in batches of batch_size, without keeping them
+
+        Every batch is released once it is inserted, so that arbitrarily
+        large generators can be inserted in constant memory.
+        """
+        inserted = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in self._stamped_batches(objs, batch_size, created=True):
+                super().bulk_create(batch, batch_size, ignore_conflicts)
+                inserted += len(batch)
+        return inserted
+
+    async def abulk_insert(
+        self,
+        objs: Iterable[_T_co],
+        batch_size: int | None = None,
+        ignore_conflicts: bool = False,  # noqa: FBT001,FBT002
+    ) -> int:
+        return await sync_to_async(self.bulk_insert)(
+            objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts
         )
 
     def bulk_update(
@@ -77,19 +234,386 @@ class BaseQuerySet(models.QuerySet[_T_co]):
         objs: Iterable[_T_co],
         fields: Iterable[str],
         batch_size: int | None = None,
+        *,
+        strategy: Literal["case", "values"] = "case",
     ) -> int:
-        dt = now()
-        for obj in objs:
-            obj.updated_at = dt  # type: ignore[attr-defined]
+        """
+        Update the fields of the objects in batches
+
+        Any iterable is accepted, and it is consumed one batch at a time.
+        Unless given, the batch size is the largest one that fits in the
+        query parameter limit of the database. The "case" strategy is the
+        CASE WHEN statement of django, while the "values" strategy joins
+        the table with a VALUES list, which PostgreSQL plans much faster
+        for large batches.
+        """
+        fields = list(fields)
         if "updated_at" not in fields:
-            fields = [*fields, "updated_at"]
-        return super().bulk_update(objs, fields, batch_size)
+            fields.append("updated_at")
+        if strategy == "values" and connections[self.db].vendor != "postgresql":
+            msg = "The values strategy is only supported on PostgreSQL"
+            raise NotSupportedError(msg)
+        batch_size = batch_size or self._update_batch_size(len(fields), strategy)
+
+        updated = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in self._stamped_batches(objs, batch_size, created=False):
+                if strategy == "values":
+                    updated += self._update_from_values(batch, fields)
+                else:
+                    updated += super().bulk_update(batch, fields, batch_size)
+        return updated
+
+    async def abulk_update(
+        self,
+        objs: Iterable[_T_co],
+        fields: Iterable[str],
+        batch_size: int | None = None,
+        *,
+        strategy: Literal["case", "values"] = "case",
+    ) -> int:
+        return await sync_to_async(self.bulk_update)(
+            objs, fields, batch_size=batch_size, strategy=strategy
+        )
+
+    def _update_batch_size(
+        self, field_count: int, strategy: Literal["case", "values"]
+    ) -> int:
+        """
+        Get the number of objects whose fields fit in the parameter limit
+
+        CASE WHEN takes the primary key and the value of every field, plus
+        the primary key in the WHERE clause, while VALUES takes each once.
+        CASE WHEN statements get slow to plan long before they run out of
+        parameters, so their batches are capped as well.
+        """
+        limit = connections[self.db].features.max_query_params or QUERY_PARAMS_LIMIT
+        if strategy == "values":
+            return max(1, limit // (field_count + 1))
+        return max(1, min(BULK_BATCH_SIZE, limit // (2 * field_count + 1)))
+
+    def _update_from_values(self, objs: list[_T_co], fields: list[str]) -> int:
+        connection = connections[self.db]
+        quote_name = connection.ops.quote_name
+        opts = self.model._meta  # noqa: SLF001
+        concrete_fields = {
+            name: field
+            for field in opts.fields
+            if field.concrete
+            for name in (field.name, field.attname)
+        }
+        if missing_fields := set(fields) - concrete_fields.keys():
+            msg = f"bulk_update() can only update concrete fields, not {missing_fields}"
+            raise ValueError(msg)
+        updated_fields = [concrete_fields[name] for name in fields]
+        if any(field.primary_key for field in updated_fields):
+            msg = "bulk_update() cannot be used with primary key fields."
+            raise ValueError(msg)
+
+        pk = next(field for field in opts.fields if field.primary_key)
+        columns = [pk, *updated_fields]
+        placeholder = ", ".join(f"%s::{field.db_type(connection)}" for field in columns)
+        params = [
+            field.get_db_prep_save(getattr(obj, field.attname), connection)
+            for obj in objs
+            for field in columns
+        ]
+        table = quote_name(opts.db_table)
+        aliases = ", ".join(quote_name(field.column) for field in columns)
+        assignments = ", ".join(
+            f"{quote_name(field.column)} = v.{quote_name(field.column)}"
+            for field in updated_fields
+        )
+        values = ", ".join([f"({placeholder})"] * len(objs))
+        sql = (
+            f"UPDATE {table} SET {assignments} "  # noqa: S608
+            f"FROM (VALUES {values}) AS v ({aliases}) "
+            f"WHERE {table}.{quote_name(pk.column)} = v.{quote_name(pk.column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return int(cursor.rowcount)
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+        """
+        Iterate over the queryset, holding at most chunk_size rows at a time
+
+        PostgreSQL streams the rows through a named cursor. When server side
+        cursors are disabled, e.g. behind a transaction pooler, the queryset
+        is paginated on its primary key instead, so the rows come in primary
+        key order. Either way, it yields whatever the queryset yields, be it
+        model instances, values() dicts or values_list() tuples.
+        """
+        connection = connections[self.db]
+        if connection.vendor == "postgresql" and not connection.settings_dict.get(
+            "DISABLE_SERVER_SIDE_CURSORS"
+        ):
+            yield from self.iterator(chunk_size=chunk_size)
+            return
+
+        pks = self.order_by("pk").values_list("pk", flat=True)
+        last_pk = None
+        while True:
+            page = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+            chunk = list(page[:chunk_size])
+            if not chunk:
+                return
+            yield from self.filter(pk__in=chunk).order_by("pk")
+            if len(chunk) < chunk_size:
+                return
+            last_pk = chunk[-1]
+
+    def seek(self, cursor: str | None = None, keys: Sequence[str] = SEEK_KEYS) -> Self:
+        """
+        Order the queryset by the keys, starting after the cursor
+
+        The cursor is an opaque string, as returned by `cursor_for`, and
+        it has to be created with the same keys. Paired with an index on
+        the keys, every page costs the same, no matter how deep it is.
+        """
+        queryset = self.order_by(*keys)
+        if cursor is None:
+            return queryset
+        values = decode_cursor(cursor, len(keys))
+        nullable = nullable_keys(self.model, keys)
+        return queryset.filter(seek_filter(keys, values, nullable))
 
     def flat_values(self, key: str) -> models.QuerySet[_T_co]:
         return cast(models.QuerySet[_T_co], self.values_list(key, flat=True))
 
+    def _estimated_count(self) -> int | None:
+        """
+        Estimate the number of rows in the table from the planner statistics
+
+        The estimate is cached for a while, so that small tables are sorted
+        randomly with a single query. It is unknown until the table is analyzed.
+        """
+        connection = connections[self.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        table = self.model._meta.db_table  # noqa: SLF001
+
+        def estimate() -> int:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)",
+                    [connection.ops.quote_name(table)],
+                )
+                row = cursor.fetchone()
+            return -1 if row is None else int(row[0])
+
+        count = cast(
+            int,
+            cache.get_or_set(
+                f"random:estimate:{self.db}:{table}",
+                estimate,
+                timeout=RANDOM_ESTIMATE_TIMEOUT,
+            ),
+        )
+        return None if count < 0 else count
+
+    def _pk_bounds(self) -> tuple[int, int] | None:
+        """
+        Get the bounds of the primary keys, if they are worth sampling from
+
+        Sorting randomly is only cheap for small tables, and it is the only
+        uniform option for filtered querysets and non integer primary keys.
+        Tables estimated to be small skip the bounds query altogether.
+        """
+        if self.query.where or self.query.is_sliced or self.query.combinator:
+            return None
+        count = self._estimated_count()
+        if count is not None and count < RANDOM_SORT_LIMIT:
+            return None
+        bounds = self.aggregate(low=Min("pk"), high=Max("pk"))
+        low, high = bounds["low"], bounds["high"]
+        if not isinstance(low, int) or not isinstance(high, int):
+            return None
+        if high - low < RANDOM_SORT_LIMIT:
+            return None
+        return low, high
+
     def random(self) -> _T_co | None:
-        return self.order_by("?").first()
+        """
+        Get a random row
+
+        Large tables are sampled by looking up random primary keys. If they
+        all miss, the row following the last one is returned, which favours
+        the rows after gaps in the keys, so it is only uniform when the keys
+        are dense enough for the lookups to hit.
+        """
+        if (bounds := self._pk_bounds()) is None:
+            return self.order_by("?").first()
+
+        low, high = bounds
+        for _ in range(RANDOM_ATTEMPTS):
+            pk = low + randbelow(high - low + 1)
+            if (obj := self.filter(pk=pk).first()) is not None:
+                return obj
+        return self.filter(pk__gte=pk).order_by("pk").first()
+
+    async def arandom(self) -> _T_co | None:
+        return await sync_to_async(self.random)()
+
+    def random_sample(self, n: int) -> list[_T_co]:
+        """
+        Get up to n distinct random rows
+
+        Large tables are sampled by looking up twice as many random primary
+        keys as needed, which is a single query unless the keys are sparse.
+        """
+        if n <= 0:
+            return []
+        if (bounds := self._pk_bounds()) is None:
+            return list(self.order_by("?")[:n])
+
+        low, high = bounds
+        system_random = SystemRandom()
+        sample: list[_T_co] = []
+        for _ in range(RANDOM_ATTEMPTS):
+            pks = system_random.sample(
+                range(low, high + 1), min(2 * (n - len(sample)), high - low + 1)
+            )
+            # the database returns the hits in whatever order suits it
+            hits = list(
+                self.filter(pk__in=pks).exclude(pk__in=[obj.pk for obj in sample])
+            )
+            system_random.shuffle(hits)
+            sample.extend(hits[: n - len(sample)])
+            if len(sample) == n:
+                return sample
+        sample.extend(
+            self.exclude(pk__in=[obj.pk for obj in sample]).order_by("?")[
+                : n - len(sample)
+            ]
+        )
+        return sample
+
+    async def arandom_sample(self, n: int) -> list[_T_co]:
+        return await sync_to_async(self.random_sample)(n)
+
+    def _identity_map(self) -> dict[tuple[type[models.Model], UUID], Any] | None:
+        # only plain instances of the whole table are shared, since objects
+        # fetched with filters, other fields, related objects or from another
+        # database can't stand in for each other
+        query = self.query
+        if (
+            self._iterable_class is not ModelIterable
+            or self.db != DEFAULT_DB_ALIAS
+            or self._prefetch_related_lookups  # type: ignore[attr-defined]
+            or query.where
+            or query.is_sliced
+            or query.combinator
+            or query.select_related
+            or query.select_for_update
+            or query.annotations
+            or query.extra
+            or query.deferred_loading[0]
+        ):
+            return None
+        return _identity_map.get()
+
+    def get_by_uuid(self, uuid: UUID | str) -> _T_co:
+        uuid = uuid if isinstance(uuid, UUID) else UUID(uuid)
+        objects = self._identity_map()
+        if objects is None:
+            return self.get(uuid=uuid)
+        key = (self.model, uuid)
+        if key not in objects:
+            objects[key] = self.get(uuid=uuid)
+        return cast(_T_co, objects[key])
+
+    async def aget_by_uuid(self, uuid: UUID | str) -> _T_co:
+        return await sync_to_async(self.get_by_uuid)(uuid)
+
+    def in_bulk_by_uuid(self, uuids: Iterable[UUID | str]) -> dict[UUID, _T_co]:
+        keys = {uuid if isinstance(uuid, UUID) else UUID(uuid) for uuid in uuids}
+        objects = self._identity_map()
+        if objects is None:
+            return {obj.uuid: obj for obj in self.filter(uuid__in=keys)}  # type: ignore[attr-defined]
+
+        if missing := [uuid for uuid in keys if (self.model, uuid) not in objects]:
+            for obj in self.filter(uuid__in=missing):
+                objects[self.model, obj.uuid] = obj  # type: ignore[attr-defined]
+        return {
+            uuid: objects[self.model, uuid]
+            for uuid in keys
+            if (self.model, uuid) in objects
+        }
+
+    async def ain_bulk_by_uuid(self, uuids: Iterable[UUID | str]) -> dict[UUID, _T_co]:
+        return await sync_to_async(self.in_bulk_by_uuid)(uuids)
+
+    def bulk_apply(
+        self, operations: Iterable[tuple[models.Q | dict[str, Any], dict[str, Any]]]
+    ) -> int:
+        """
+        Apply many updates in one transaction, with a single timestamp
+
+        Every operation is a filter and the changes for the rows matching
+        it. Operations that change the same fields are folded into a single
+        UPDATE with a CASE per field, and operations with the same changes
+        share a WHEN. The filters are expected not to overlap, and the
+        changes can be values or expressions, like F("level") + 1. Changes
+        with unhashable values, like JSON lists, get a WHEN of their own.
+        Filters that follow relations are matched through a subquery on
+        the primary key, since a CASE can't join other tables.
+        """
+        shapes: dict[frozenset[str], dict[Hashable, tuple[dict[str, Any], models.Q]]]
+        shapes = {}
+        for lookups, changes in operations:
+            if not changes:
+                continue
+            condition = (
+                lookups if isinstance(lookups, models.Q) else models.Q(**lookups)
+            )
+            folded = shapes.setdefault(frozenset(changes), {})
+            key = _fold_key(changes)
+            if key in folded:
+                condition = folded[key][1] | condition
+            folded[key] = (changes, condition)
+
+        dt = now()
+        opts = self.model._meta  # noqa: SLF001
+        updated = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for fields, folded in shapes.items():
+                if len(folded) == 1:
+                    [(changes, condition)] = folded.values()
+                else:
+                    condition = reduce(or_, (when for _, when in folded.values()))
+                    whens = [
+                        (
+                            then,
+                            (
+                                models.Q(pk__in=self.filter(when).values("pk"))
+                                if _joins(self.model, when)
+                                else when
+                            ),
+                        )
+                        for then, when in folded.values()
+                    ]
+                    changes = {}
+                    for name in fields:
+                        field = cast(models.Field[Any, Any], opts.get_field(name))
+                        changes[name] = models.Case(
+                            *(
+                                models.When(when, then=_case_value(then[name], field))
+                                for then, when in whens
+                            ),
+                            default=models.F(name),
+                            output_field=field,
+                        )
+                updated += self.filter(condition).update(
+                    **{"updated_at": dt, **changes}
+                )
+        return updated
+
+    async def abulk_apply(
+        self, operations: Iterable[tuple[models.Q | dict[str, Any], dict[str, Any]]]
+    ) -> int:
+        return await sync_to_async(self.bulk_apply)(operations)
 
     def update(self, **kwargs: Any) -> int:
         kwargs.setdefault("updated_at", now())
@@ -97,7 +621,7 @@ class BaseQuerySet(models.QuerySet[_T_co]):
 
 
 class BaseModel(models.Model):
-    uuid = models.UUIDField(default=uuid4, editable=False)
+    uuid = models.UUIDField(default=uuid4, editable=False, unique=True)
     created_at = models.DateTimeField(default=now, editable=False)
     updated_at = models.DateTimeField(default=now, editable=False)
 
@@ -109,3 +633,8 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=["created_at", "id"], name="%(app_label)s_%(class)s_seek"
+            ),
+        ]
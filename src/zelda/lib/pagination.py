@@ -0,0 +1,169 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Generic, TypeVar
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+
+_T = TypeVar("_T", bound=models.Model)
+
+SEEK_KEYS = ("created_at", "id")
+# a filter that matches no rows, which drops out of the queries it is part of
+NO_ROWS = models.Q(pk__in=[])
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        # django rounds to milliseconds, which would skip or repeat rows
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps(list(values), cls=CursorEncoder, separators=(",", ":"))
+    return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list[Any]:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (BinasciiError, UnicodeDecodeError, ValueError) as exc:
+        msg = f"Invalid cursor: {cursor}"
+        raise InvalidCursorError(msg) from exc
+    if not isinstance(values, list) or len(values) != length:
+        msg = f"Invalid cursor: {cursor}"
+        raise InvalidCursorError(msg)
+    return values
+
+
+def nullable_keys(model: type[models.Model], keys: Sequence[str]) -> set[str]:
+    """
+    Get the keys that can be null
+
+    Keys that follow relations can also be null when any relation on the
+    way is, since the join leaves the fields of missing rows null.
+    """
+    nullable = set()
+    for key in keys:
+        name = key.removeprefix("-")
+        related: type[models.Model] | str | None = model
+        for part in name.split(LOOKUP_SEP):
+            # past the last relation, the rest of the key is a transform
+            if not isinstance(related, type):
+                break
+            try:
+                field = related._meta.get_field(part)  # noqa: SLF001
+            except FieldDoesNotExist:
+                break
+            if getattr(field, "null", False):
+                nullable.add(name)
+                break
+            related = field.related_model
+    return nullable
+
+
+def seek_filter(
+    keys: Sequence[str], values: Sequence[Any], nullable: Collection[str] = ()
+) -> models.Q:
+    """
+    Get the filter for the rows that come after the values, in key order
+
+    The keys are field names, optionally prefixed with "-" for descending
+    order. Nulls sort like PostgreSQL sorts them, last in ascending order
+    and first in descending order, so the keys that can be null have to
+    be passed as nullable. Unless it could be null, the first key is also
+    compared on its own, so that the database can seek to the first row
+    through an index on the keys.
+    """
+    after = NO_ROWS
+    for key, value in reversed(list(zip(keys, values, strict=True))):
+        name = key.removeprefix("-")
+        descending = key.startswith("-")
+        if value is None:
+            # only the values that come first in descending order follow a null
+            beyond = models.Q(**{f"{name}__isnull": False}) if descending else NO_ROWS
+            tie = models.Q(**{f"{name}__isnull": True})
+        else:
+            beyond = models.Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if name in nullable and not descending:
+                beyond |= models.Q(**{f"{name}__isnull": True})
+            tie = models.Q(**{name: value})
+        after = beyond | (tie & after)
+
+    name = keys[0].removeprefix("-")
+    descending = keys[0].startswith("-")
+    if values[0] is None or (name in nullable and not descending):
+        return after
+    lookup = "lte" if descending else "gte"
+    return models.Q(**{f"{name}__{lookup}": values[0]}) & after
+
+
+def cursor_for(obj: models.Model, keys: Sequence[str] = SEEK_KEYS) -> str:
+    return encode_cursor(
+        [attrgetter(key.removeprefix("-").replace("__", "."))(obj) for key in keys]
+    )
+
+
+@dataclass(frozen=True)
+class KeysetPage(Generic[_T]):
+    object_list: list[_T]
+    next_cursor: str | None
+
+
+class KeysetPaginator(Paginator[Any]):
+    """
+    A paginator that seeks to the start of every page
+
+    The keys are taken from the ordering of the object list, and they
+    have to be field names or lookups through relations, with the primary
+    key as a tie breaker.
+    Pages that come after a cursor cost the same no matter how deep they
+    are, paired with an index on the keys. Numbered pages are still
+    paginated with offsets, and so is any other ordering.
+    """
+
+    keys: list[str] | None
+    queryset: models.QuerySet[Any]
+
+    def __init__(self, object_list: models.QuerySet[Any], *args: Any, **kwargs: Any):
+        ordering = object_list.query.order_by or SEEK_KEYS
+        if all(isinstance(key, str) for key in ordering):
+            self.keys = [str(key) for key in ordering]
+            if not {"pk", "-pk", "id", "-id"} & set(self.keys):
+                self.keys.append("pk")
+            object_list = object_list.order_by(*self.keys)
+        else:
+            self.keys = None
+        self.queryset = object_list
+        super().__init__(object_list, *args, **kwargs)
+
+    def page_after(self, cursor: str | None = None) -> KeysetPage[Any]:
+        if self.keys is None:
+            msg = "Keyset pagination needs an ordering on plain field names"
+            raise ValueError(msg)
+
+        object_list = self.queryset
+        if cursor is not None:
+            values = decode_cursor(cursor, len(self.keys))
+            nullable = nullable_keys(self.queryset.model, self.keys)
+            object_list = object_list.filter(seek_filter(self.keys, values, nullable))
+        objects = list(object_list[: self.per_page + 1])
+        if len(objects) <= self.per_page:
+            return KeysetPage(object_list=objects, next_cursor=None)
+        objects = objects[: self.per_page]
+        return KeysetPage(
+            object_list=objects, next_cursor=cursor_for(objects[-1], self.keys)
+        )
@@ -0,0 +1,131 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import jinja2 as jinja
+
+from django.http import HttpRequest
+from django.template import Context, TemplateDoesNotExist, base
+from django.template.backends import django, jinja2
+from django.template.base import Origin
+from django.templatetags.static import static
+from django.test.signals import template_rendered
+from django.test.utils import instrumented_test_render  # type: ignore[attr-defined]
+from django.urls import reverse
+from django.utils.safestring import SafeString
+
+_render_timings: ContextVar[list[tuple[str, float]] | None] = ContextVar(
+    "render_timings", default=None
+)
+
+
+@contextmanager
+def render_timings() -> Iterator[list[tuple[str, float]]]:
+    """
+    Collect the name and render time of every template until the end of the block
+
+    Only the templates rendered through the engine are timed, the ones
+    they include are part of their time.
+    """
+    timings: list[tuple[str, float]] = []
+    token = _render_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _render_timings.reset(token)
+
+
+@contextmanager
+def _timed(origin: Origin | jinja2.Origin) -> Iterator[None]:
+    if (timings := _render_timings.get()) is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        name = origin.template_name or origin.name
+        timings.append((str(name), perf_counter() - start))
+
+
+class Template(django.Template):
+    def render(
+        self,
+        context: Context | dict[str, Any] | None = None,
+        request: HttpRequest | None = None,
+    ) -> SafeString:
+        with _timed(self.origin):
+            return super().render(context, request)
+
+
+class DjangoTemplates(django.DjangoTemplates):
+    """
+    The django template engine, timing the templates that it renders
+    """
+
+    def from_string(self, template_code: str) -> Template:
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Template:
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            django.reraise(exc, self)
+
+
+def url(viewname: str, *args: Any, **kwargs: Any) -> str:
+    return reverse(viewname, args=args, kwargs=kwargs)
+
+
+def environment(
+    *, bytecode_cache_dir: Path | None = None, **options: Any
+) -> jinja.Environment:
+    """
+    Create the jinja2 environment, with the static and url of the django tags
+
+    With a bytecode cache directory, the compiled templates are kept on
+    disk, so that new processes only parse the templates that changed.
+    """
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        options["bytecode_cache"] = jinja.FileSystemBytecodeCache(
+            str(bytecode_cache_dir)
+        )
+    # the engine turns autoescape on, unless its options turn it off
+    env = jinja.Environment(**options)  # noqa: S701
+    env.globals.update({"static": static, "url": url})
+    return env
+
+
+class Jinja2Template(jinja2.Template):
+    def render(
+        self,
+        context: Context | dict[str, Any] | None = None,
+        request: HttpRequest | None = None,
+    ) -> SafeString:
+        context = {} if context is None else context
+        # like django templates, only send the signal that the test client
+        # collects the context of the responses from in the test environment
+        render = base.Template._render  # type: ignore[attr-defined]  # noqa: SLF001
+        if render is instrumented_test_render:
+            template_rendered.send(sender=self, template=self, context=context)
+        with _timed(self.origin):
+            rendered: SafeString = super().render(context, request)
+        return rendered
+
+
+class Jinja2(jinja2.Jinja2):
+    """
+    The jinja2 template engine, timing the templates that it renders
+    """
+
+    def from_string(self, template_code: str) -> Jinja2Template:
+        return Jinja2Template(self.env.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> Jinja2Template:
+        template = super().get_template(template_name)
+        return Jinja2Template(template.template, self)  # type: ignore[attr-defined]
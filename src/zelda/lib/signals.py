@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from zelda.lib.middleware import record_query
+
+
+@receiver(connection_created)
+def instrument_connection(connection: BaseDatabaseWrapper, **_kwargs: Any) -> None:
+    # the wrappers outlive reconnections, and the ones of execute_wrapper
+    # blocks are popped from the end
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
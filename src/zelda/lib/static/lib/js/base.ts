@@ -1,7 +1,22 @@
+function toggleMaxedOut(hideMaxedOut: boolean): void {
+    document
+        .querySelectorAll<HTMLTableRowElement>("tr.armor-row")
+        .forEach((row) => {
+            row.hidden =
+                hideMaxedOut &&
+                row.dataset.currentLevel === row.dataset.maxLevel;
+        });
+    document
+        .querySelectorAll<HTMLTableRowElement>("tr.cost-row")
+        .forEach((row) => {
+            row.hidden = hideMaxedOut && row.dataset.quantity === "0";
+        });
+}
+
 // eslint-disable-next-line @typescript-eslint/no-unused-vars
 function saveMaxedOutPreference(that): void {
     const isChecked = that.checked;
     const maxAge = 60 * 60 * 24 * 365;
     document.cookie = `hideMaxedOut=${isChecked}; max-age=${maxAge}; path=/`;
-    location.reload();
+    toggleMaxedOut(isChecked);
 }
@@ -1,4 +1,5 @@
 import hashlib
+import json
 import logging
 from collections.abc import Callable
 from functools import wraps
@@ -11,6 +12,8 @@ from django.conf import settings
 from django.db.migrations.loader import MigrationLoader
 from django.db.migrations.writer import MigrationWriter
 
+from zelda.lib.types import JsonType
+
 logger = logging.getLogger(__name__)
 INGEST_ERROR = "Function `%s` threw `%s` when called with args=%s and kwargs=%s"
 P = ParamSpec("P")
@@ -64,6 +67,18 @@ def hash_file(path: Path, buffer_size: int = 2**16) -> str:
     return sha256.hexdigest()
 
 
+def hash_json(data: JsonType) -> str:
+    """
+    Hash JSON serializable data
+
+    The data is serialized canonically, so that equal data always has
+    the same hash, regardless of the order of the keys.
+    """
+    sha256 = hashlib.sha256()
+    sha256.update(json.dumps(data, sort_keys=True, separators=(",", ":")).encode())
+    return sha256.hexdigest()
+
+
 def hash_migrations() -> list[str]:
     loader = MigrationLoader(None, ignore_no_migrations=True)
     hashes = []
@@ -0,0 +1,67 @@
+from datetime import datetime
+from secrets import randbits
+from threading import Lock
+from time import time_ns
+from uuid import UUID
+
+from zelda.lib.date_utils import UTC
+
+VERSION = 7
+COUNTER_BITS = 74
+RAND_B_BITS = 62
+
+
+class _Clock:
+    """
+    The timestamp and counter of the latest UUIDv7 of the process
+
+    The counter starts at a random value with its top bit cleared for
+    every new millisecond, and it is incremented for every UUID within the
+    same one, so that the UUIDs keep increasing even if the clock goes
+    back. On the very unlikely overflow, the timestamp is moved forward.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.timestamp = 0
+        self.counter = 0
+
+    def tick(self) -> tuple[int, int]:
+        timestamp = time_ns() // 1_000_000
+        with self.lock:
+            if timestamp > self.timestamp:
+                self.timestamp = timestamp
+                self.counter = randbits(COUNTER_BITS - 1)
+            else:
+                self.counter += 1
+                if self.counter >> COUNTER_BITS:
+                    self.timestamp += 1
+                    self.counter = randbits(COUNTER_BITS - 1)
+            return self.timestamp, self.counter
+
+
+_clock = _Clock()
+
+
+def uuid7() -> UUID:
+    """
+    Generate a time ordered UUID, as defined by RFC 9562
+
+    The UUIDs generated by a process are strictly increasing, so that
+    indexes on them are appended to, instead of being split at random.
+    """
+    timestamp, counter = _clock.tick()
+    return UUID(
+        int=timestamp << 80
+        | VERSION << 76
+        | (counter >> RAND_B_BITS) << 64
+        | 0b10 << 62
+        | counter & ((1 << RAND_B_BITS) - 1)
+    )
+
+
+def uuid7_timestamp(uuid: UUID) -> datetime:
+    if uuid.version != VERSION:
+        msg = f"{uuid} is not a version {VERSION} UUID"
+        raise ValueError(msg)
+    return datetime.fromtimestamp((uuid.int >> 80) / 1000, tz=UTC)
@@ -1,5 +1,10 @@
 from typing import Any
 
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.models import AnonymousUser
 from django.forms import BaseForm
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
@@ -10,13 +15,39 @@ class LoginRequiredError(RuntimeError):
     pass
 
 
+async def auser(request: HttpRequest) -> AbstractBaseUser | AnonymousUser:
+    """
+    Get the user of the request asynchronously, and set it on the request
+
+    The user of the request is otherwise fetched again, synchronously, as
+    soon as something like a template reads it.
+    """
+    # the stubs type request.auser as a sync callable, returning a user of
+    # any model, while request.user is typed with the project's one
+    user: AbstractBaseUser | AnonymousUser = await request.auser()  # type: ignore[misc]
+    request.user = user  # type: ignore[assignment]
+    return user
+
+
 class BaseView(View):
+    """
+    A view that renders its context with a template
+
+    A view can also have a jinja2 version of its template, which is
+    rendered instead if JINJA2_TEMPLATES is on. The django template stays
+    the reference that the jinja2 one has to match.
+    """
+
     template_name: str
+    jinja2_template_name: str | None = None
+    query_budget: int | None = None
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         return kwargs
 
     def get_template_name(self, **_kwargs: Any) -> str:
+        if self.jinja2_template_name is not None and settings.JINJA2_TEMPLATES:
+            return self.jinja2_template_name
         return self.template_name
 
     def render(self, context: dict[str, Any]) -> HttpResponse:
@@ -33,6 +64,28 @@ class BaseView(View):
         return self.render(context)
 
 
+class AsyncBaseView(BaseView):
+    """
+    A view whose handlers run on the event loop
+
+    The user is fetched before the context is computed, so that neither
+    of them query it from the event loop.
+    """
+
+    async def aget_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        return await sync_to_async(self.get_context_data)(**kwargs)
+
+    async def get(  # type: ignore[override]
+        self, request: HttpRequest, *_args: Any, **kwargs: Any
+    ) -> HttpResponse:
+        await auser(request)
+        try:
+            context = await self.aget_context_data(**kwargs)
+        except LoginRequiredError:
+            return redirect("login")
+        return self.render(context)
+
+
 class BaseFormView(BaseView):
     form_class: type[BaseForm]
 
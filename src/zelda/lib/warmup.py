@@ -0,0 +1,81 @@
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.template.backends.base import BaseEngine
+from django.template.backends.django import DjangoTemplates
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+WARMED_UP = "Warmed up %s in %.1fms"
+POOL_TIMEOUT = 30
+
+
+def template_dirs(engine: BaseEngine) -> Iterator[Path]:
+    if not isinstance(engine, DjangoTemplates):
+        yield from map(Path, engine.template_dirs)
+        return
+
+    # with explicit loaders, only the loaders know where the templates are
+    for loader in engine.engine.template_loaders:
+        if hasattr(loader, "get_dirs"):
+            yield from map(Path, loader.get_dirs())
+
+
+def iter_templates() -> Iterator[tuple[BaseEngine, str]]:
+    """
+    Find the templates of every engine, in lookup order
+
+    A template that is overridden by an earlier directory, like the admin
+    templates of the branding app, is only found once.
+    """
+    for engine in engines.all():
+        names: set[str] = set()
+        for directory in template_dirs(engine):
+            for path in sorted(directory.rglob("*")):
+                name = path.relative_to(directory).as_posix()
+                if path.is_file() and name not in names:
+                    names.add(name)
+                    yield engine, name
+
+
+def warm_templates() -> None:
+    # the loaders cache the compiled templates for the life of the process
+    for engine, name in iter_templates():
+        engine.get_template(name)
+
+
+def warm_urls() -> None:
+    # resolving the first reverse imports every view, and the admin
+    get_resolver().reverse_dict  # noqa: B018
+
+
+def warm_databases() -> None:
+    """
+    Connect to every database, waiting for their pools to be filled
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
+        if (pool := getattr(connection, "pool", None)) is not None:
+            pool.wait(timeout=POOL_TIMEOUT)
+
+
+def warm_up() -> None:
+    """
+    Run the WARM_UP functions, so that the first requests don't pay for them
+
+    The connections are closed afterwards, which returns pooled ones to
+    their pool, as the thread that warms up doesn't serve any request.
+    """
+    try:
+        for path in settings.WARM_UP:
+            start = perf_counter()
+            import_string(path)()
+            logger.info(WARMED_UP, path, (perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
@@ -3,3 +3,11 @@ from uvicorn.workers import UvicornWorker as BaseUvicornWorker
 
 class UvicornWorker(BaseUvicornWorker):
     CONFIG_KWARGS = BaseUvicornWorker.CONFIG_KWARGS.copy() | {"lifespan": "off"}
+
+
+class LifespanUvicornWorker(BaseUvicornWorker):
+    """
+    A worker that warms up the application before accepting requests
+    """
+
+    CONFIG_KWARGS = BaseUvicornWorker.CONFIG_KWARGS.copy() | {"lifespan": "on"}
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from zelda.armor.models import Armor
+from zelda.lib.admin import KeysetModelAdmin
+from zelda.lib.pagination import SEEK_KEYS
 from zelda.registration.models import User
 
 
@@ -11,7 +13,7 @@ class UserArmorInline(admin.TabularInline[Armor, User]):
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(KeysetModelAdmin[User], BaseUserAdmin):
     fieldsets = (
         (None, {"fields": ["email", "password"]}),
         ("Permissions", {"fields": ["is_active", "is_staff", "is_superuser"]}),
@@ -21,6 +23,6 @@ class UserAdmin(BaseUserAdmin):
         (None, {"classes": ["wide"], "fields": ["email", "password1", "password2"]}),
     )
     search_fields = ("email",)
-    ordering = ("email",)
+    ordering = SEEK_KEYS
     list_display = ("email", "is_staff")
     inlines = (UserArmorInline,)
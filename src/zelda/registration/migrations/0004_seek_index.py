@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("armor", "0004_seek_indexes"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("registration", "0003_add_default_superuser"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["created_at", "id"], name="registration_user_seek"
+            ),
+        ),
+    ]
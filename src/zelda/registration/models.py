@@ -64,7 +64,7 @@ class User(AbstractUser, BaseModel):
     objects: ClassVar[UserManager] = UserManager()
     armor_levels: ClassVar[models.Manager[UserArmor]]
 
-    class Meta(AbstractUser.Meta):
+    class Meta(AbstractUser.Meta, BaseModel.Meta):
         swappable = "AUTH_USER_MODEL"
 
     def __str__(self) -> str:
@@ -77,6 +77,7 @@ if DEBUG:
     ]
 
 MIDDLEWARE = [
+    "zelda.lib.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -85,24 +86,50 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "zelda.lib.middleware.WhiteNoiseMiddleware",
+    "zelda.lib.middleware.IdentityMapMiddleware",
 ]
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "zelda.lib.rendering.DjangoTemplates",
+        "NAME": "django",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
-            ]
+            ],
+            # templates are compiled once per process, the development
+            # server resets the cache whenever a template changes
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                )
+            ],
+        },
+    },
+    {
+        "BACKEND": "zelda.lib.rendering.Jinja2",
+        "NAME": "jinja2",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "environment": "zelda.lib.rendering.environment",
+            "bytecode_cache_dir": BASE_DIR.joinpath(".jinja2"),
         },
-    }
+    },
 ]
+# views with a jinja2 template render it instead of their django one
+JINJA2_TEMPLATES = project_setting(
+    "JINJA2_TEMPLATES", sections=["project", "app"], rtype=bool, default=False
+)
 
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
 EMAIL_FILE_PATH = BASE_DIR.joinpath("local", "emails")
@@ -114,8 +141,90 @@ LOGOUT_REDIRECT_URL = "/"
 # endregion
 
 # region Databases
+DATABASE_POOL = project_setting(
+    "DATABASE_POOL", sections=["project", "databases"], rtype=bool, default=False
+)
+DATABASE_POOL_SIZE = project_setting(
+    "DATABASE_POOL_SIZE", sections=["project", "databases"], rtype=int, default=4
+)
+DATABASE_POOL_OVERFLOW = project_setting(
+    "DATABASE_POOL_OVERFLOW", sections=["project", "databases"], rtype=int, default=8
+)
+DATABASE_POOL_TIMEOUT = project_setting(
+    "DATABASE_POOL_TIMEOUT", sections=["project", "databases"], rtype=float, default=10
+)
 DATABASES = {
-    "default": {"ENGINE": "django.db.backends.postgresql", "NAME": "zelda"},
+    "default": {
+        "ENGINE": "zelda.lib.backends.postgresql",
+        "NAME": "zelda",
+        # pooled connections go back to the pool at the end of every request
+        "CONN_MAX_AGE": (
+            0
+            if DATABASE_POOL
+            else project_setting(
+                "CONN_MAX_AGE", sections=["project", "databases"], rtype=int, default=0
+            )
+        ),
+        "CONN_HEALTH_CHECKS": project_setting(
+            "CONN_HEALTH_CHECKS",
+            sections=["project", "databases"],
+            rtype=bool,
+            default=True,
+        ),
+        "DISABLE_SERVER_SIDE_CURSORS": project_setting(
+            "DISABLE_SERVER_SIDE_CURSORS",
+            sections=["project", "databases"],
+            rtype=bool,
+            default=False,
+        ),
+        "OPTIONS": (
+            {
+                "pool": {
+                    "min_size": DATABASE_POOL_SIZE,
+                    "max_size": DATABASE_POOL_SIZE + DATABASE_POOL_OVERFLOW,
+                    "timeout": DATABASE_POOL_TIMEOUT,
+                },
+            }
+            if DATABASE_POOL
+            else {}
+        ),
+    },
+}
+# endregion
+
+# region Query instrumentation
+QUERY_SAMPLE_RATE = project_setting(
+    "QUERY_SAMPLE_RATE",
+    sections=["project", "instrumentation"],
+    rtype=float,
+    default=0.01,
+)
+QUERY_REPEAT_THRESHOLD = project_setting(
+    "QUERY_REPEAT_THRESHOLD",
+    sections=["project", "instrumentation"],
+    rtype=int,
+    default=5,
+)
+QUERY_BUDGET_STRICT = project_setting(
+    "QUERY_BUDGET_STRICT",
+    sections=["project", "instrumentation"],
+    rtype=bool,
+    default=False,
+)
+# endregion
+
+# region Caches
+CACHES = {
+    "default": {
+        "BACKEND": project_setting(
+            "CACHE_BACKEND",
+            sections=["project", "caches"],
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": project_setting(
+            "CACHE_LOCATION", sections=["project", "caches"], default="zelda"
+        ),
+    },
 }
 # endregion
 
@@ -140,6 +249,16 @@ LANGUAGE_CODE = "en"
 LANGUAGES = [("en", "English")]
 # endregion
 
+# region Warm-up
+# run by the lifespan of the ASGI application, before accepting requests
+WARM_UP = [
+    "zelda.lib.warmup.warm_databases",
+    "zelda.lib.warmup.warm_urls",
+    "zelda.lib.warmup.warm_templates",
+    "zelda.armor.catalog.get_catalog",
+]
+# endregion
+
 # region 3rd party
 GRAPPELLI_INDEX_DASHBOARD = "zelda.home.dashboard.AdminDashboard"
 GRAPPELLI_ADMIN_TITLE = "zelda"
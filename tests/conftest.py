@@ -1,8 +1,9 @@
 from typing import Any
 
 import pytest
+from pytest_django.fixtures import SettingsWrapper
 
-from django.test import Client
+from django.test import AsyncClient, Client
 
 
 class HttpTestClient(Client):
@@ -11,6 +12,28 @@ class HttpTestClient(Client):
         super().__init__(*args, **kwargs)
 
 
+class AsyncHttpTestClient(AsyncClient):
+    # the headers given to an async client are not sent, so they are
+    # added to every request instead
+    def generic(self, *args: Any, **kwargs: Any) -> Any:
+        kwargs["headers"] = {
+            "X-Forwarded-Proto": "https",
+            **(kwargs.get("headers") or {}),
+        }
+        return super().generic(*args, **kwargs)
+
+
 @pytest.fixture()
 def http_client() -> HttpTestClient:
     return HttpTestClient()
+
+
+@pytest.fixture()
+def async_http_client() -> AsyncHttpTestClient:
+    return AsyncHttpTestClient()
+
+
+@pytest.fixture(autouse=True)
+def _strict_query_budget(settings: SettingsWrapper) -> None:
+    settings.QUERY_BUDGET_STRICT = True
+    settings.QUERY_SAMPLE_RATE = 1
@@ -0,0 +1,102 @@
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+
+from zelda.armor import catalog as catalog_module
+from zelda.armor.catalog import (
+    CATALOG_VERSION_KEY,
+    FREE_TO_UPGRADE,
+    MAXED_OUT,
+    aget_catalog,
+    get_catalog,
+    invalidate_catalog,
+)
+from zelda.armor.models import Armor, ArmorUpgradeCost
+
+
+@pytest.fixture(autouse=True)
+def _fresh_catalog() -> Iterator[None]:
+    invalidate_catalog()
+    yield
+    invalidate_catalog()
+
+
+@pytest.mark.django_db()
+def test_catalog_contains_all_armor() -> None:
+    assert len(get_catalog().armor) == Armor.objects.count()
+
+
+@pytest.mark.django_db()
+def test_catalog_is_cached(django_assert_num_queries: Callable[[int], Any]) -> None:
+    catalog = get_catalog()
+    with django_assert_num_queries(0):
+        assert get_catalog() is catalog
+
+
+@pytest.mark.django_db()
+def test_warm_catalog_is_returned_without_a_thread(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    catalog = async_to_sync(aget_catalog)()
+    monkeypatch.delattr(catalog_module, "sync_to_async")
+    assert async_to_sync(aget_catalog)() is catalog
+
+
+@pytest.mark.django_db()
+def test_remaining_cost_matches_database() -> None:
+    for entry in get_catalog().armor:
+        for current_level in range(-1, entry.max_level + 1):
+            expected: dict[str, int] = {}
+            costs = ArmorUpgradeCost.objects.filter(
+                armor_id=entry.id, level__gt=current_level
+            )
+            for cost in costs:
+                expected[cost.item] = expected.get(cost.item, 0) + cost.quantity
+            assert dict(entry.remaining_cost(current_level).items()) == expected
+
+
+@pytest.mark.django_db()
+def test_tooltips() -> None:
+    entry = next(entry for entry in get_catalog().armor if entry.name == "Hylian Hood")
+    levels = [
+        "0: 70x Rupee",
+        "1: 5x Bokoblin Horn 10x Rupee",
+        "2: 5x Blue Bokoblin Horn 3x Bokoblin Fang 50x Rupee",
+        "3: 20x Amber 3x Bokoblin Guts 5x Black Bokoblin Horn 200x Rupee",
+        "4: 30x Amber 5x Bokoblin Guts 5x Silver Bokoblin Horn 500x Rupee",
+    ]
+    assert entry.tooltip(-1).split("&#10;") == levels
+    assert entry.tooltip(3).startswith("4: ")
+    assert entry.tooltip(entry.max_level) == MAXED_OUT
+    assert entry.tooltip(entry.max_level + 1) == FREE_TO_UPGRADE
+
+
+@pytest.mark.django_db()
+def test_catalog_follows_shared_version(
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    catalog = get_catalog()
+    # another process bumped the version
+    cache.set(CATALOG_VERSION_KEY, "changed", timeout=None)
+    with django_assert_num_queries(2):
+        assert get_catalog() is not catalog
+
+
+@pytest.mark.django_db()
+def test_catalog_invalidated_on_commit(
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    catalog = get_catalog()
+    armor = Armor.objects.get(name="Hylian Hood")
+    with django_capture_on_commit_callbacks(execute=True):
+        ArmorUpgradeCost.objects.create(
+            armor=armor, level=armor.max_level, quantity=1, item_code="ACORN"
+        )
+        assert get_catalog() is catalog
+    assert get_catalog() is not catalog
+    entry = next(entry for entry in get_catalog().armor if entry.id == armor.id)
+    assert entry.remaining_cost(armor.max_level - 1)["ACORN"] == 1
@@ -0,0 +1,110 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from zelda.armor.catalog import get_catalog_version
+from zelda.armor.loaders import (
+    LoadResult,
+    load_armor,
+    read_armor_definitions,
+    sync_armor,
+)
+from zelda.armor.models import Armor, ArmorUpgradeCost
+
+
+def test_definitions() -> None:
+    definitions = list(read_armor_definitions())
+    assert {
+        type(quantity)
+        for definition in definitions
+        for quantity in definition.costs.values()
+    } == {int}
+    definition = definitions[0]
+    assert definition.name == "Hylian Hood"
+    assert definition.max_level == 4
+    assert definition.costs[0, "RUPEE"] == 70
+    assert definition.costs[4, "RUPEE"] == 500
+
+
+@pytest.mark.django_db()
+def test_load_is_idempotent(django_assert_num_queries: Callable[[int], Any]) -> None:
+    definitions = list(read_armor_definitions())
+    costs = ArmorUpgradeCost.objects.count()
+    with django_assert_num_queries(4):
+        result = load_armor(definitions)
+    assert result == LoadResult(armor=0, costs=0, deleted_costs=0)
+    assert ArmorUpgradeCost.objects.count() == costs
+
+
+@pytest.mark.django_db()
+def test_load_restores_definitions() -> None:
+    definitions = list(read_armor_definitions())
+    armor = Armor.objects.get(name="Hylian Hood")
+    armor.max_level = 1
+    armor.save()
+    armor.costs.filter(level=0).update(quantity=1)
+    armor.costs.filter(level=4).delete()
+    ArmorUpgradeCost.objects.create(armor=armor, level=2, quantity=1, item_code="ACORN")
+
+    result = load_armor(definitions)
+
+    assert result == LoadResult(armor=1, costs=5, deleted_costs=1)
+    armor.refresh_from_db()
+    assert armor.max_level == 4
+    assert armor.costs.get(level=0).quantity == 70
+    assert armor.costs.filter(level=4).count() == 4
+    assert not armor.costs.filter(item_code="ACORN").exists()
+
+
+@pytest.mark.django_db()
+def test_load_creates_armor() -> None:
+    definitions = list(read_armor_definitions())
+    Armor.objects.filter(name="Hylian Hood").delete()
+
+    result = load_armor(definitions)
+
+    assert result == LoadResult(armor=1, costs=14, deleted_costs=0)
+    assert Armor.objects.get(name="Hylian Hood").costs.count() == 14
+
+
+@pytest.mark.django_db()
+def test_sync_skips_unchanged_armor(
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    definitions = list(read_armor_definitions())
+    armor = Armor.objects.get(name="Hylian Hood")
+    with django_assert_num_queries(1):
+        result = sync_armor(definitions)
+    assert result == LoadResult(armor=0, costs=0, deleted_costs=0)
+    assert Armor.objects.get(name="Hylian Hood").updated_at == armor.updated_at
+
+
+@pytest.mark.django_db()
+def test_sync_loads_changed_armor() -> None:
+    definitions = list(read_armor_definitions())
+    armor = Armor.objects.get(name="Hylian Hood")
+    other_armor = Armor.objects.get(name="Hylian Tunic")
+    armor.digest = ""
+    armor.save()
+    armor.costs.filter(level=0).update(quantity=1)
+
+    result = sync_armor(definitions)
+
+    assert result == LoadResult(armor=1, costs=1, deleted_costs=0)
+    assert armor.costs.get(level=0).quantity == 70
+    assert Armor.objects.get(name="Hylian Tunic").updated_at == other_armor.updated_at
+
+
+@pytest.mark.django_db()
+def test_sync_invalidates_catalog_on_commit(
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    definitions = list(read_armor_definitions())
+    Armor.objects.filter(name="Hylian Hood").update(digest="")
+    version = get_catalog_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        sync_armor(definitions)
+
+    assert get_catalog_version() != version
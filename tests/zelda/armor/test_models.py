@@ -0,0 +1,148 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from django.db.models import F
+
+from zelda.armor.models import Armor, UserArmor, UserArmorQuerySet
+from zelda.armor.versions import get_progress_version
+from zelda.lib.choices import BodyPart
+from zelda.registration.models import User
+
+BODY_PART_RANK = {BodyPart.HEAD.key: 0, BodyPart.BODY.key: 1, BodyPart.LEGS.key: 2}
+
+
+def display_key(armor: Armor) -> tuple[bool, str, int, str]:
+    if not armor.set_code:
+        return True, "", 0, armor.name
+    return False, armor.set_code, BODY_PART_RANK[armor.body_part_code], armor.name
+
+
+@pytest.mark.django_db()
+def test_in_display_order() -> None:
+    Armor.objects.create(
+        name="aardvark mask", body_part_code=BodyPart.HEAD.key, max_level=0
+    )
+    Armor.objects.create(name="Zzz Mask", body_part_code=BodyPart.HEAD.key, max_level=0)
+    armor = list(Armor.objects.in_display_order())
+    assert armor == sorted(armor, key=display_key)
+    assert armor[0].set_code
+    assert armor[-1].name == "aardvark mask"
+
+
+@pytest.mark.django_db()
+def test_manager_has_queryset_helpers() -> None:
+    armor = Armor.objects.in_display_order().first()
+    assert armor is not None
+    assert Armor.objects.get_by_uuid(armor.uuid) == armor
+    assert Armor.objects.in_bulk_by_uuid([armor.uuid]) == {armor.uuid: armor}
+
+
+def test_armor_labels() -> None:
+    armor = Armor(set_code="HYLIAN_SET", body_part_code=BodyPart.LEGS.key)
+    assert armor.armor_set == "Hylian Set"
+    assert armor.body_part == "Legs"
+
+
+def create_levels(levels: UserArmorQuerySet, spare: Armor) -> object:
+    user_ids = {level.user_id for level in levels}
+    return levels.bulk_create(
+        UserArmor(user_id=user_id, armor=spare, level=0) for user_id in user_ids
+    )
+
+
+def update_levels(levels: UserArmorQuerySet, _spare: Armor) -> object:
+    return levels.bulk_update(
+        [UserArmor(pk=level.pk, user_id=level.user_id, level=1) for level in levels],
+        ["level"],
+    )
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda levels, _spare: levels.update(level=F("level") + 1),
+        lambda levels, _spare: levels.bulk_apply([({"level": 0}, {"level": 1})]),
+        lambda levels, _spare: levels.delete(),
+        update_levels,
+        create_levels,
+    ],
+    ids=["update", "bulk_apply", "delete", "bulk_update", "bulk_create"],
+)
+def test_writes_bump_progress_once_per_user(
+    write: Callable[[UserArmorQuerySet, Armor], object],
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    users = User.objects.bulk_create(
+        User(email=f"user{index}@example.com") for index in range(3)
+    )
+    *armor, spare = Armor.objects.order_by("id")[:4]
+    UserArmor.objects.bulk_create(
+        UserArmor(user=user, armor=item, level=0) for user in users for item in armor
+    )
+    versions = [get_progress_version(user.pk) for user in users]
+    levels = UserArmor.objects.filter(user__in=users[:2])
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        write(levels, spare)
+
+    assert len(callbacks) == 1
+    assert [
+        get_progress_version(user.pk) != version
+        for user, version in zip(users, versions, strict=True)
+    ] == [True, True, False]
+
+
+@pytest.mark.django_db()
+def test_user_levels_are_deleted_in_bulk(
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    user = User.objects.create_user(email="link@example.com")
+    UserArmor.objects.bulk_create(
+        UserArmor(user=user, armor=armor, level=0)
+        for armor in Armor.objects.order_by("id")[:3]
+    )
+    # the users are known from the filter, and nothing is collected
+    with django_assert_num_queries(1):
+        user.armor_levels.all().delete()
+
+
+@pytest.mark.django_db()
+def test_manager_inserts_levels_in_bulk(
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    user = User.objects.create_user(email="link@example.com")
+    version = get_progress_version(user.pk)
+    with django_capture_on_commit_callbacks(execute=True):
+        UserArmor.objects.bulk_insert(
+            UserArmor(user=user, armor=armor, level=0)
+            for armor in Armor.objects.order_by("id")[:3]
+        )
+    assert user.armor_levels.count() == 3
+    assert get_progress_version(user.pk) != version
+
+
+@pytest.mark.django_db()
+def test_bulk_apply_filters_through_relations(
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    users = User.objects.bulk_create(
+        User(email=f"user{index}@example.com") for index in range(3)
+    )
+    armor = Armor.objects.order_by("id").first()
+    UserArmor.objects.bulk_create(
+        UserArmor(user=user, armor=armor, level=0) for user in users
+    )
+    # the users whose progress changes, and a single update
+    with django_assert_num_queries(2):
+        updated = UserArmor.objects.bulk_apply(
+            ({"user__email": user.email}, {"level": level})
+            for level, user in enumerate(users[:2], start=1)
+        )
+    assert updated == 2
+    assert [
+        level.level
+        for level in UserArmor.objects.filter(user__in=users).order_by("user_id")
+    ] == [1, 2, 0]
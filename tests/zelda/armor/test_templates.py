@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from zelda.armor.models import Armor, UserArmor
+from zelda.armor.progress import ArmorProgress
+from zelda.registration.models import User
+
+CSRF_TOKEN = re.compile(r'(name="csrfmiddlewaretoken" value=)"[^"]*"')
+
+
+def normalize(html: str) -> str:
+    # the engines lay out whitespace and escape quotes differently, and the
+    # csrf token is masked anew on every render
+    html = CSRF_TOKEN.sub(r'\1"csrf"', html).replace("&#x27;", "&#39;")
+    return " ".join(html.split())
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("hide_maxed_out", [True, False])
+@pytest.mark.parametrize("is_superuser", [True, False])
+def test_armor_templates_match(
+    rf: RequestFactory, hide_maxed_out: bool, is_superuser: bool
+) -> None:
+    user = User.objects.create_user(email="link@example.com", is_superuser=is_superuser)
+    UserArmor.objects.bulk_create(
+        UserArmor(user=user, armor=armor, level=index % (armor.max_level + 1))
+        for index, armor in enumerate(Armor.objects.order_by("id"))
+    )
+    progress = ArmorProgress.for_user(user)
+    request = rf.get("/")
+    request.user = user
+    context = {
+        "user_armor": progress.user_armor,
+        "remaining_cost": progress.remaining_cost,
+        "hide_maxed_out": hide_maxed_out,
+    }
+
+    reference = render_to_string("armor/armor.html", context, request)
+    rendered = render_to_string("armor/armor.jinja", context, request)
+
+    assert "Champion&#x27;s Tunic" in reference
+    assert normalize(rendered) == normalize(reference)
@@ -0,0 +1,196 @@
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+
+from django.urls import reverse
+
+from zelda.armor.catalog import get_catalog
+from zelda.armor.models import Armor, UserArmor
+from zelda.registration.models import User
+
+from tests.conftest import AsyncHttpTestClient, HttpTestClient
+
+
+@pytest.fixture()
+def user() -> User:
+    return User.objects.create_user(email="link@example.com")
+
+
+@pytest.mark.django_db()
+def test_armor_requires_login(http_client: HttpTestClient) -> None:
+    response = http_client.get(reverse("armor:armor"))
+    assert response.status_code == HTTPStatus.FOUND
+
+
+@pytest.mark.django_db()
+def test_armor_view(
+    http_client: HttpTestClient,
+    user: User,
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    armor = Armor.objects.order_by("name").first()
+    assert armor is not None
+    UserArmor.objects.create(user=user, armor=armor, level=armor.max_level)
+    http_client.force_login(user)
+    get_catalog()
+
+    with django_assert_num_queries(3):
+        response = http_client.get(reverse("armor:armor"))
+
+    assert response.status_code == HTTPStatus.OK
+    user_armor = response.context["user_armor"]
+    assert len(user_armor) == Armor.objects.count()
+    assert user_armor[armor.name]["current_level"] == armor.max_level
+    assert user_armor[armor.name]["tooltip"] == "Maxed out"
+
+
+@pytest.mark.django_db()
+def test_armor_view_async(
+    async_http_client: AsyncHttpTestClient,
+    user: User,
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    # the ORM would refuse to query synchronously from the event loop
+    armor = Armor.objects.get(name="Hylian Hood")
+    UserArmor.objects.create(user=user, armor=armor, level=2)
+    async_http_client.force_login(user)
+    get_catalog()
+
+    with django_assert_num_queries(3):
+        response = async_to_sync(async_http_client.get)(reverse("armor:armor"))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.context["user_armor"][armor.name]["current_level"] == 2
+    server_timing = response.headers["Server-Timing"]
+    assert 'desc="3 queries"' in server_timing
+    assert 'desc="armor/armor.html"' in server_timing
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize(
+    ("jinja2_templates", "template_name"),
+    [(True, "armor/armor.jinja"), (False, "armor/armor.html")],
+)
+def test_armor_view_template(
+    http_client: HttpTestClient,
+    user: User,
+    settings: SettingsWrapper,
+    jinja2_templates: bool,
+    template_name: str,
+) -> None:
+    settings.JINJA2_TEMPLATES = jinja2_templates
+    http_client.force_login(user)
+    response = http_client.get(reverse("armor:armor"))
+    assert response.status_code == HTTPStatus.OK
+    assert response.templates[0].origin.template_name == template_name
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("changed", [1, 40])
+def test_update_armor_uses_fixed_number_of_queries(
+    http_client: HttpTestClient,
+    user: User,
+    changed: int,
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    armor = list(Armor.objects.order_by("id"))
+    UserArmor.objects.bulk_create(
+        [UserArmor(user=user, armor=item, level=0) for item in armor[: 3 * changed]]
+    )
+    data = {item.name: "0" for item in armor[: 3 * changed]}
+    data.update({item.name: "" for item in armor[:changed]})
+    data.update(
+        {item.name: str(item.max_level) for item in armor[changed : 2 * changed]}
+    )
+    data.update({item.name: "0" for item in armor[-changed:]})
+    http_client.force_login(user)
+    get_catalog()
+
+    with django_assert_num_queries(8):
+        response = http_client.post(reverse("armor:update-armor"), data)
+
+    assert response.status_code == HTTPStatus.FOUND
+    levels = dict(user.armor_levels.values_list("armor__name", "level"))
+    assert levels == {name: int(level) for name, level in data.items() if level}
+
+
+@pytest.mark.django_db()
+def test_update_armor_async(
+    async_http_client: AsyncHttpTestClient,
+    user: User,
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    armor = Armor.objects.get(name="Hylian Hood")
+    async_http_client.force_login(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = async_to_sync(async_http_client.post)(
+            reverse("armor:update-armor"), {armor.name: "3"}
+        )
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert user.armor_levels.get().level == 3
+
+
+@pytest.mark.django_db()
+def test_progress_requires_login(http_client: HttpTestClient) -> None:
+    response = http_client.get(reverse("armor:progress"))
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.django_db()
+def test_progress_conditional_get(
+    http_client: HttpTestClient,
+    user: User,
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    armor = Armor.objects.get(name="Hylian Hood")
+    http_client.force_login(user)
+
+    response = http_client.get(reverse("armor:progress"))
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+    data = response.json()
+    assert data["user_armor"]["Hylian Hood"]["current_level"] == ""
+    assert data["remaining_cost"]["Amber"] > 0
+
+    response = http_client.get(reverse("armor:progress"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        UserArmor.objects.create(user=user, armor=armor, level=2)
+    response = http_client.get(reverse("armor:progress"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["user_armor"]["Hylian Hood"]["current_level"] == 2
+
+
+@pytest.mark.django_db()
+def test_armor_view_is_cached_until_progress_changes(
+    http_client: HttpTestClient,
+    user: User,
+    django_assert_num_queries: Callable[[int], Any],
+    django_capture_on_commit_callbacks: Callable[..., Any],
+) -> None:
+    armor = Armor.objects.get(name="Hylian Hood")
+    http_client.force_login(user)
+    http_client.get(reverse("armor:armor"))
+
+    with django_assert_num_queries(2):
+        response = http_client.get(reverse("armor:armor"))
+    assert response.context["user_armor"][armor.name]["current_level"] == ""
+
+    with django_capture_on_commit_callbacks(execute=True):
+        http_client.post(reverse("armor:update-armor"), {armor.name: "3"})
+    response = http_client.get(reverse("armor:armor"))
+    assert response.context["user_armor"][armor.name]["current_level"] == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        UserArmor.objects.filter(user=user).get().delete()
+    response = http_client.get(reverse("armor:armor"))
+    assert response.context["user_armor"][armor.name]["current_level"] == ""
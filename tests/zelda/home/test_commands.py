@@ -0,0 +1,32 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+
+def test_compiletemplates() -> None:
+    stdout = StringIO()
+    call_command("compiletemplates", verbosity=2, stdout=stdout)
+    output = stdout.getvalue()
+    assert "django: armor/armor.html in " in output
+    assert "django: lib/base.html in " in output
+    assert "Compiled " in output
+
+
+def test_compiletemplates_syntax_error(
+    settings: SettingsWrapper, tmp_path: Path
+) -> None:
+    tmp_path.joinpath("broken.html").write_text("{% if %}")
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "zelda.lib.rendering.DjangoTemplates",
+            "DIRS": [tmp_path],
+            "NAME": "broken",
+        }
+    ]
+    with pytest.raises(CommandError, match="broken: broken.html: "):
+        call_command("compiletemplates")
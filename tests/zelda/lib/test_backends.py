@@ -0,0 +1,62 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from zelda.lib.backends.postgresql.base import DatabaseWrapper
+
+
+def pooled_settings(**settings: Any) -> dict[str, Any]:
+    return {
+        **connection.settings_dict,
+        "OPTIONS": {"pool": {"min_size": 1, "max_size": 1}},
+        **settings,
+    }
+
+
+@pytest.fixture()
+def pooled() -> Iterator[DatabaseWrapper]:
+    wrapper = DatabaseWrapper(pooled_settings(), alias="pooled")
+    yield wrapper
+    wrapper.close()
+    wrapper.close_pool()
+
+
+@pytest.mark.django_db()
+def test_pooled_connections_are_reused(pooled: DatabaseWrapper) -> None:
+    with pooled.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
+    raw_connection = pooled.connection
+    pooled.close()
+    assert pooled.connection is None
+    assert raw_connection is not None
+    assert not raw_connection.closed
+
+    pooled.ensure_connection()
+    assert pooled.connection is raw_connection
+    assert pooled.get_autocommit()
+
+
+@pytest.mark.django_db()
+def test_pool_is_shared_by_the_alias(pooled: DatabaseWrapper) -> None:
+    other = DatabaseWrapper(pooled_settings(), alias="pooled")
+    pool = pooled.pool
+    assert pool is not None
+    assert other.pool is pool
+    pooled.close_pool()
+    assert pool.closed
+    assert other.pool is not pool
+
+
+def test_pooled_connections_cannot_be_persistent() -> None:
+    with pytest.raises(ImproperlyConfigured):
+        DatabaseWrapper(pooled_settings(CONN_MAX_AGE=60), alias="pooled")
+
+
+def test_without_pool() -> None:
+    wrapper = DatabaseWrapper(dict(connection.settings_dict), alias="unpooled")
+    assert wrapper.pool is None
@@ -17,4 +17,26 @@ class TestChoices:
             CHOICE2 = auto()
 
         options = Options.choices()
-        assert options == sorted(options)
+        assert list(options) == sorted(options)
+
+    def test_lookups(self) -> None:
+        class Options(choices.Choices):
+            FIRST_CHOICE = auto()
+            SECOND_CHOICE = auto()
+
+        assert Options.label_for("SECOND_CHOICE") == "Second Choice"
+        assert Options.key_for("First Choice") == "FIRST_CHOICE"
+        assert Options.index_of("SECOND_CHOICE") == 1
+        assert Options.keys() == ("FIRST_CHOICE", "SECOND_CHOICE")
+        assert Options.labels() == ("First Choice", "Second Choice")
+
+    def test_lookup_tables_are_per_class(self) -> None:
+        class Options(choices.Choices):
+            CHOICE = auto()
+
+        class OtherOptions(choices.Choices):
+            OTHER_CHOICE = auto()
+
+        assert Options.choices() == (("CHOICE", "Choice"),)
+        assert OtherOptions.choices() == (("OTHER_CHOICE", "Other Choice"),)
+        assert OtherOptions.index_of("OTHER_CHOICE") == 0
@@ -0,0 +1,44 @@
+import pytest
+
+from zelda.lib.choices import Item
+from zelda.lib.costs import CostVector
+
+
+def test_empty_vector() -> None:
+    vector = CostVector()
+    assert not vector
+    assert len(vector) == len(Item.keys())
+    assert set(vector.to_dict().values()) == {0}
+
+
+def test_from_costs() -> None:
+    vector = CostVector.from_costs([("AMBER", 3), ("RUPEE", 10), ("AMBER", 2)])
+    assert vector["AMBER"] == 5
+    assert vector["RUPEE"] == 10
+    assert dict(vector.items()) == {"Amber": 5, "Rupee": 10}
+
+
+def test_arithmetic() -> None:
+    small = CostVector.from_costs([("AMBER", 1)])
+    large = CostVector.from_costs([("AMBER", 3), ("ACORN", 2)])
+    assert (small + large)["AMBER"] == 4
+    assert large - small == CostVector.from_costs([("AMBER", 2), ("ACORN", 2)])
+    with pytest.raises(OverflowError):
+        small - large
+
+
+def test_sum() -> None:
+    vectors = [CostVector.from_costs([("AMBER", n)]) for n in range(5)]
+    assert CostVector.sum(vectors)["AMBER"] == 10
+    assert CostVector.sum([]) == CostVector()
+
+
+def test_suffix_sums() -> None:
+    levels = [CostVector.from_costs([("RUPEE", 10**n)]) for n in range(3)]
+    sums = CostVector.suffix_sums(levels)
+    assert [vector["RUPEE"] for vector in sums] == [111, 110, 100, 0]
+
+
+def test_wrong_size() -> None:
+    with pytest.raises(ValueError):
+        CostVector([1, 2, 3])
@@ -0,0 +1,47 @@
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from pytest_django.fixtures import SettingsWrapper
+
+from zelda.lib.lifespan import LifespanApplication, Scope
+
+
+def fail() -> None:
+    msg = "Cold"
+    raise RuntimeError(msg)
+
+
+async def application(_scope: Scope, _receive: Any, _send: Any) -> None:
+    pytest.fail("The lifespan messages reached the application")
+
+
+def run_lifespan(*messages: str) -> list[Mapping[str, Any]]:
+    received = [{"type": f"lifespan.{message}"} for message in messages]
+    sent: list[Mapping[str, Any]] = []
+
+    async def receive() -> Mapping[str, Any]:
+        return received.pop(0)
+
+    async def send(message: Mapping[str, Any]) -> None:
+        sent.append(message)
+
+    lifespan = LifespanApplication(application)
+    async_to_sync(lifespan)({"type": "lifespan"}, receive, send)
+    return sent
+
+
+def test_lifespan(settings: SettingsWrapper) -> None:
+    settings.WARM_UP = ["zelda.lib.warmup.warm_urls"]
+    assert run_lifespan("startup", "shutdown") == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+
+
+def test_lifespan_startup_failed(settings: SettingsWrapper) -> None:
+    settings.WARM_UP = ["zelda.lib.warmup.warm_urls", f"{__name__}.fail"]
+    assert run_lifespan("startup") == [
+        {"type": "lifespan.startup.failed", "message": "RuntimeError('Cold')"}
+    ]
@@ -0,0 +1,160 @@
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any, cast
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from pytest_django.fixtures import SettingsWrapper
+
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory
+
+from zelda.lib.middleware import (
+    IdentityMapMiddleware,
+    QueryBudgetExceededError,
+    QueryInstrumentationMiddleware,
+    WhiteNoiseMiddleware,
+)
+from zelda.lib.views import BaseView
+from zelda.registration.models import User
+
+
+@pytest.mark.django_db()
+def test_identity_map_middleware(
+    django_assert_num_queries: Callable[[int], Any],
+) -> None:
+    user = User.objects.create_user(email="link@example.com")
+
+    def get_response(_request: HttpRequest) -> HttpResponse:
+        assert User.objects.get_by_uuid(user.uuid) is User.objects.get_by_uuid(
+            user.uuid
+        )
+        return HttpResponse()
+
+    middleware = IdentityMapMiddleware(get_response)
+    with django_assert_num_queries(1):
+        middleware(RequestFactory().get("/"))
+    with django_assert_num_queries(1):
+        middleware(RequestFactory().get("/"))
+
+
+class UsersView(BaseView):
+    query_budget = 3
+
+    def get(self, request: HttpRequest, *_args: Any, **_kwargs: Any) -> HttpResponse:
+        for _ in range(int(request.GET["queries"])):
+            User.objects.filter(email="link@example.com").exists()
+        return HttpResponse()
+
+
+def run_view(queries: int) -> HttpResponse:
+    view = UsersView.as_view()
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        middleware.process_view(request, view, (), {})
+        return cast(HttpResponse, view(request))
+
+    middleware = QueryInstrumentationMiddleware(get_response)
+    request = RequestFactory().get("/users", {"queries": queries})
+    return cast(HttpResponse, middleware(request))
+
+
+@pytest.mark.django_db()
+def test_query_instrumentation_middleware(caplog: pytest.LogCaptureFixture) -> None:
+    response = run_view(3)
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["Server-Timing"].endswith(';desc="3 queries"')
+    assert not caplog.records
+
+
+@pytest.mark.django_db()
+def test_query_instrumentation_middleware_over_budget() -> None:
+    with pytest.raises(QueryBudgetExceededError, match="ran 4 queries"):
+        run_view(4)
+
+
+@pytest.mark.django_db()
+def test_query_instrumentation_middleware_repeated_queries(
+    settings: SettingsWrapper, caplog: pytest.LogCaptureFixture
+) -> None:
+    settings.QUERY_BUDGET_STRICT = False
+    run_view(5)
+    assert [record.getMessage() for record in caplog.records] == [
+        "Query ran 5 times in /users, possibly an N+1: "
+        'SELECT %s AS "a" FROM "registration_user" '
+        'WHERE "registration_user"."email" = %s LIMIT 1',
+        "/users ran 5 queries, over its budget of 3",
+    ]
+
+
+@pytest.mark.django_db()
+def test_query_instrumentation_middleware_sampling(settings: SettingsWrapper) -> None:
+    settings.QUERY_SAMPLE_RATE = 0
+    assert "Server-Timing" not in run_view(5).headers
+
+
+@pytest.mark.django_db()
+def test_query_instrumentation_middleware_async() -> None:
+    view = UsersView.as_view()
+
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        await cast(Awaitable[None], middleware.process_view(request, view, (), {}))
+        for _ in range(4):
+            await User.objects.filter(email="link@example.com").aexists()
+        return HttpResponse()
+
+    async def call() -> HttpResponse:
+        return await cast(
+            Awaitable[HttpResponse], middleware(RequestFactory().get("/users"))
+        )
+
+    middleware = QueryInstrumentationMiddleware(get_response)
+    assert iscoroutinefunction(middleware.process_view)
+    with pytest.raises(QueryBudgetExceededError, match="ran 4 queries"):
+        async_to_sync(call)()
+
+
+@pytest.fixture()
+def _static_settings(settings: SettingsWrapper) -> None:
+    settings.WHITENOISE_AUTOREFRESH = True
+    settings.WHITENOISE_USE_FINDERS = True
+
+
+@pytest.mark.usefixtures("_static_settings")
+@pytest.mark.parametrize(
+    ("path", "status"),
+    [
+        ("/static/lib/css/base.css", HTTPStatus.OK),
+        ("/static/missing.css", HTTPStatus.NOT_FOUND),
+        ("/", HTTPStatus.NOT_FOUND),
+    ],
+)
+def test_whitenoise_middleware(path: str, status: int) -> None:
+    def get_response(_request: HttpRequest) -> HttpResponse:
+        return HttpResponse(status=HTTPStatus.NOT_FOUND)
+
+    middleware = WhiteNoiseMiddleware(get_response)
+    response = cast(HttpResponse, middleware(RequestFactory().get(path)))
+    assert response.status_code == status
+
+
+@pytest.mark.usefixtures("_static_settings")
+@pytest.mark.parametrize(
+    ("path", "status"),
+    [
+        ("/static/lib/css/base.css", HTTPStatus.OK),
+        ("/static/missing.css", HTTPStatus.NOT_FOUND),
+        ("/", HTTPStatus.NOT_FOUND),
+    ],
+)
+def test_whitenoise_middleware_async(path: str, status: int) -> None:
+    async def get_response(_request: HttpRequest) -> HttpResponse:
+        return HttpResponse(status=HTTPStatus.NOT_FOUND)
+
+    async def call() -> HttpResponse:
+        return await cast(
+            Awaitable[HttpResponse], middleware(RequestFactory().get(path))
+        )
+
+    middleware = WhiteNoiseMiddleware(get_response)
+    assert async_to_sync(call)().status_code == status
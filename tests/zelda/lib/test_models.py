@@ -1,5 +1,16 @@
+from collections.abc import Callable, Iterator
+from typing import Any, Literal
+
 import pytest
+from asgiref.sync import async_to_sync
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q, Value
+from django.test.utils import CaptureQueriesContext
 
+from zelda.lib import models
+from zelda.lib.models import identity_map
 from zelda.registration.models import User
 
 
@@ -32,10 +43,226 @@ class TestBaseModel:
     def test_bulk_create(self) -> None:
         assert User.objects.count() == 3
 
+    @pytest.mark.django_db()
+    def test_bulk_create_generator(
+        self, django_assert_num_queries: Callable[[int], Any]
+    ) -> None:
+        emails = [f"user{index}@example.com" for index in range(5)]
+        with django_assert_num_queries(3):
+            users = User.objects.bulk_create(
+                (User(email=email) for email in emails), batch_size=2
+            )
+        assert [user.email for user in users] == emails
+        assert len({user.created_at for user in users}) == 1
+        assert User.objects.filter(email__in=emails).count() == 5
+
+    @pytest.mark.django_db()
+    def test_bulk_insert(self, django_assert_num_queries: Callable[[int], Any]) -> None:
+        emails = [f"user{index}@example.com" for index in range(5)]
+        with django_assert_num_queries(2):
+            inserted = User.objects.bulk_insert(
+                (User(email=email) for email in emails), batch_size=3
+            )
+        assert inserted == 5
+        assert User.objects.filter(email__in=emails).count() == 5
+
+    @pytest.mark.django_db()
+    def test_bulk_apply(self, django_assert_num_queries: Callable[[int], Any]) -> None:
+        with django_assert_num_queries(2):
+            updated = User.objects.bulk_apply(
+                [
+                    ({"email": "user1@gmail.com"}, {"is_staff": True}),
+                    (Q(email="user2@gmail.com"), {"is_staff": True}),
+                    ({"email": "user3@gmail.com"}, {"is_staff": False}),
+                    ({"email": "user3@gmail.com"}, {"is_active": False}),
+                    ({"email": "user1@gmail.com"}, {}),
+                ]
+            )
+        assert updated == 4
+        users = {user.email: user for user in User.objects.all()}
+        assert [users[email].is_staff for email in sorted(users)] == [
+            True,
+            True,
+            False,
+        ]
+        assert [users[email].is_active for email in sorted(users)] == [
+            True,
+            True,
+            False,
+        ]
+        assert len({user.updated_at for user in users.values()}) == 1
+
+    @pytest.mark.django_db()
+    def test_bulk_apply_unhashable(
+        self, django_assert_num_queries: Callable[[int], Any]
+    ) -> None:
+        class UnhashableStr(str):
+            __slots__ = ()
+            __hash__ = None  # type: ignore[assignment]
+
+        with django_assert_num_queries(1):
+            updated = User.objects.bulk_apply(
+                [
+                    ({"email": "user1@gmail.com"}, {"email": UnhashableStr("a@a.com")}),
+                    ({"email": "user2@gmail.com"}, {"email": UnhashableStr("b@b.com")}),
+                    ({"email": "user3@gmail.com"}, {"email": "c@c.com"}),
+                ]
+            )
+        assert updated == 3
+        assert set(User.objects.values_list("email", flat=True)) == {
+            "a@a.com",
+            "b@b.com",
+            "c@c.com",
+        }
+
     @pytest.mark.django_db()
     def test_random(self) -> None:
         assert User.objects.random().email in self.emails
 
+    @pytest.mark.django_db()
+    def test_random_small_table(
+        self, django_assert_num_queries: Callable[[int], Any]
+    ) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE registration_user")
+        cache.clear()
+        User.objects.random()
+        with django_assert_num_queries(1):
+            user = User.objects.random()
+        assert user is not None
+        assert user.email in self.emails
+
+    @pytest.mark.django_db()
+    def test_random_without_sorting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(models, "RANDOM_SORT_LIMIT", 0)
+        with CaptureQueriesContext(connection) as context:
+            user = User.objects.random()
+        assert user is not None
+        assert user.email in self.emails
+        assert not any("RANDOM()" in query["sql"] for query in context.captured_queries)
+
+    @pytest.mark.django_db()
+    def test_random_filtered(self) -> None:
+        user = User.objects.filter(email="user2@gmail.com").random()
+        assert user is not None
+        assert user.email == "user2@gmail.com"
+        assert User.objects.filter(email="").random() is None
+
+    @pytest.mark.django_db()
+    @pytest.mark.parametrize("limit", [0, 1000])
+    def test_random_sample(self, monkeypatch: pytest.MonkeyPatch, limit: int) -> None:
+        monkeypatch.setattr(models, "RANDOM_SORT_LIMIT", limit)
+        sample = User.objects.random_sample(2)
+        assert len({user.email for user in sample}) == 2
+        assert {user.email for user in sample} <= self.emails
+        assert {user.email for user in User.objects.random_sample(5)} == self.emails
+        assert User.objects.random_sample(0) == []
+
+    @pytest.mark.django_db()
+    def test_random_sample_is_uniform(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(models, "RANDOM_SORT_LIMIT", 0)
+        User.objects.bulk_create(
+            User(email=f"user{index}@example.com") for index in range(17)
+        )
+        ranks = {
+            pk: rank
+            for rank, pk in enumerate(
+                User.objects.order_by("pk").values_list("pk", flat=True)
+            )
+        }
+        draws = [
+            ranks[user.pk] for _ in range(400) for user in User.objects.random_sample(1)
+        ]
+        # the mean rank of 20 users is 9.5, and it would be about 6 if the
+        # lowest of the looked up keys were always picked
+        assert len(draws) == 400
+        assert sum(draws) / len(draws) == pytest.approx(9.5, abs=1.5)
+
+    @pytest.mark.django_db()
+    @pytest.mark.parametrize(
+        ("disable_server_side_cursors", "queries"), [(False, 1), (True, 4)]
+    )
+    def test_stream(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        django_assert_num_queries: Callable[[int], Any],
+        disable_server_side_cursors: bool,
+        queries: int,
+    ) -> None:
+        monkeypatch.setitem(
+            connection.settings_dict,
+            "DISABLE_SERVER_SIDE_CURSORS",
+            disable_server_side_cursors,
+        )
+        with django_assert_num_queries(queries):
+            users = list(User.objects.stream(chunk_size=2))
+        values = list(User.objects.values("email").stream(chunk_size=2))
+        assert {user.email for user in users} == self.emails
+        assert {value["email"] for value in values} == self.emails
+
+    @pytest.mark.django_db()
+    def test_get_by_uuid(self, django_assert_num_queries: Callable[[int], Any]) -> None:
+        user = User.objects.get(email="user1@gmail.com")
+        with django_assert_num_queries(2):
+            assert User.objects.get_by_uuid(user.uuid) == user
+            assert User.objects.get_by_uuid(str(user.uuid)) == user
+        with identity_map(), django_assert_num_queries(2):
+            fetched_user = User.objects.get_by_uuid(user.uuid)
+            assert User.objects.get_by_uuid(str(user.uuid)) is fetched_user
+            assert User.objects.filter(is_staff=True).in_bulk_by_uuid([user.uuid]) == {}
+
+    @pytest.mark.django_db()
+    def test_get_by_uuid_shapes(
+        self, django_assert_num_queries: Callable[[int], Any]
+    ) -> None:
+        user = User.objects.get(email="user1@gmail.com")
+        with identity_map(), django_assert_num_queries(4):
+            values = User.objects.values("email").get_by_uuid(user.uuid)
+            assert values == {"email": user.email}
+            annotated_user = User.objects.annotate(n=Value(1)).get_by_uuid(user.uuid)
+            assert annotated_user.n == 1
+            partial_user = User.objects.only("email").get_by_uuid(user.uuid)
+            fetched_user = User.objects.get_by_uuid(user.uuid)
+            assert fetched_user == user
+            assert fetched_user is not partial_user
+            assert User.objects.get_by_uuid(user.uuid) is fetched_user
+
+    @pytest.mark.django_db()
+    def test_in_bulk_by_uuid(
+        self, django_assert_num_queries: Callable[[int], Any]
+    ) -> None:
+        users = {user.uuid: user for user in User.objects.all()}
+        first_uuid, *other_uuids = users
+        with identity_map(), django_assert_num_queries(2):
+            assert User.objects.in_bulk_by_uuid([first_uuid]) == {
+                first_uuid: users[first_uuid]
+            }
+            assert User.objects.in_bulk_by_uuid(users) == users
+            assert User.objects.in_bulk_by_uuid(other_uuids) == {
+                uuid: users[uuid] for uuid in other_uuids
+            }
+
+    @pytest.mark.django_db()
+    def test_async_helpers(self) -> None:
+        async def run() -> None:
+            user = await User.objects.arandom()
+            assert user is not None
+            assert user.email in self.emails
+            sample = await User.objects.arandom_sample(2)
+            assert len({user.email for user in sample}) == 2
+            with identity_map():
+                fetched_user = await User.objects.aget_by_uuid(user.uuid)
+                assert await User.objects.aget_by_uuid(user.uuid) is fetched_user
+                assert await User.objects.ain_bulk_by_uuid([user.uuid]) == {
+                    user.uuid: fetched_user
+                }
+            operations = [({"pk": user.pk}, {"is_staff": True})]
+            assert await User.objects.abulk_apply(operations) == 1
+            emails = User.objects.filter(is_staff=True).flat_values("email")
+            assert [email async for email in emails] == [user.email]
+
+        async_to_sync(run)()
+
     @pytest.mark.django_db()
     def test_flat_values(self) -> None:
         assert set(User.objects.flat_values("email")) == self.emails
@@ -55,3 +282,55 @@ class TestBaseModel:
         updated_users = User.objects.bulk_update(users, fields=["is_staff"])
         assert updated_users == 3
         assert User.objects.filter(is_staff=True).count() == 3
+
+    @pytest.mark.django_db()
+    @pytest.mark.parametrize("strategy", ["case", "values"])
+    def test_bulk_update_generator(
+        self,
+        django_assert_num_queries: Callable[[int], Any],
+        strategy: Literal["case", "values"],
+    ) -> None:
+        users = list(User.objects.order_by("id"))
+        updated_at = users[0].updated_at
+
+        def staff_users() -> Iterator[User]:
+            for user in users:
+                user.is_staff = True
+                user.is_active = False
+                yield user
+
+        with django_assert_num_queries(2):
+            updated_users = User.objects.bulk_update(
+                staff_users(),
+                fields=["is_staff", "is_active"],
+                batch_size=2,
+                strategy=strategy,
+            )
+        assert updated_users == 3
+        for user in User.objects.all():
+            assert user.is_staff
+            assert not user.is_active
+            assert user.updated_at > updated_at
+
+    @pytest.mark.django_db()
+    def test_bulk_update_values_rejects_primary_key(self) -> None:
+        with pytest.raises(ValueError, match="primary key"):
+            User.objects.bulk_update(
+                User.objects.all(), fields=["id"], strategy="values"
+            )
+
+    @pytest.mark.django_db()
+    @pytest.mark.parametrize(("strategy", "queries"), [("case", 2), ("values", 1)])
+    def test_bulk_update_batch_size(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        django_assert_num_queries: Callable[[int], Any],
+        strategy: Literal["case", "values"],
+        queries: int,
+    ) -> None:
+        # is_staff and updated_at take 5 parameters per user with CASE WHEN
+        # and 3 with VALUES, so 10 parameters fit 2 and 3 users respectively
+        monkeypatch.setattr(models, "QUERY_PARAMS_LIMIT", 10)
+        users = list(User.objects.all())
+        with django_assert_num_queries(queries):
+            User.objects.bulk_update(users, fields=["is_staff"], strategy=strategy)
@@ -0,0 +1,139 @@
+from datetime import UTC, datetime
+from http import HTTPStatus
+
+import pytest
+
+from django.urls import reverse
+
+from zelda.armor.models import ArmorUpgradeCost
+from zelda.lib.pagination import (
+    InvalidCursorError,
+    KeysetPaginator,
+    cursor_for,
+    decode_cursor,
+    encode_cursor,
+)
+from zelda.registration.models import User
+
+from tests.conftest import HttpTestClient
+
+
+@pytest.fixture()
+def users() -> list[User]:
+    User.objects.all().delete()
+    users: list[User] = User.objects.bulk_create(
+        User(email=f"user{index % 4}{index}@example.com") for index in range(10)
+    )
+    return users
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor(["2024-01-01T00:00:00Z", 1])
+    assert decode_cursor(cursor, 2) == ["2024-01-01T00:00:00Z", 1]
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", encode_cursor([1])])
+def test_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, 2)
+
+
+@pytest.mark.django_db()
+def test_seek(users: list[User]) -> None:
+    # all the users share the same creation time, so the id breaks the ties
+    assert list(User.objects.seek()) == users
+    assert list(User.objects.seek(cursor_for(users[3]))) == users[4:]
+    keys = ["-email", "id"]
+    ordered_users = sorted(users, key=lambda user: user.email, reverse=True)
+    cursor = cursor_for(ordered_users[5], keys)
+    assert list(User.objects.seek(cursor, keys)) == ordered_users[6:]
+
+
+@pytest.mark.django_db()
+@pytest.mark.usefixtures("users")
+@pytest.mark.parametrize("ordering", [(), ("email", "-pk"), ("-created_at", "id")])
+def test_paginator_pages_match_offsets(ordering: tuple[str, ...]) -> None:
+    queryset = User.objects.order_by(*ordering or ("created_at", "id"))
+    paginator = KeysetPaginator(User.objects.order_by(*ordering), 3, orphans=1)
+    assert paginator.num_pages == 3
+    assert list(paginator.page(1)) == list(queryset[:3])
+    assert list(paginator.page(2)) == list(queryset[3:6])
+    assert list(paginator.page(3)) == list(queryset[6:])
+
+
+@pytest.mark.django_db()
+def test_paginator_page_after(users: list[User]) -> None:
+    paginator = KeysetPaginator(User.objects.order_by("email"), 4)
+    seen: list[User] = []
+    cursor = None
+    for _ in range(3):
+        page = paginator.page_after(cursor)
+        seen.extend(page.object_list)
+        cursor = page.next_cursor
+    assert cursor is None
+    assert seen == sorted(users, key=lambda user: user.email)
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("keys", [("last_login", "id"), ("-last_login", "-id")])
+def test_paginator_page_after_nulls(users: list[User], keys: tuple[str, ...]) -> None:
+    for index, user in enumerate(users[:5]):
+        user.last_login = datetime(2024, 1, 1 + index % 2, tzinfo=UTC)
+    User.objects.bulk_update(users, ["last_login"])
+    paginator = KeysetPaginator(User.objects.order_by(*keys), 3)
+    seen: list[User] = []
+    cursor = None
+    for _ in range(4):
+        page = paginator.page_after(cursor)
+        seen.extend(page.object_list)
+        cursor = page.next_cursor
+    assert cursor is None
+    assert seen == list(User.objects.order_by(*keys))
+
+
+@pytest.mark.django_db()
+def test_paginator_page_after_related_nulls() -> None:
+    # costs of armor without a set sort last
+    keys = ("armor__set_code", "created_at", "id")
+    paginator = KeysetPaginator(ArmorUpgradeCost.objects.order_by(*keys), 100)
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = paginator.page_after(cursor)
+        seen.extend(cost.pk for cost in page.object_list)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert ArmorUpgradeCost.objects.filter(armor__set_code__isnull=True).exists()
+    assert seen == list(
+        ArmorUpgradeCost.objects.order_by(*keys).values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db()
+def test_admin_changelist(http_client: HttpTestClient) -> None:
+    admin = User.objects.create_superuser(email="admin@example.com")
+    http_client.force_login(admin)
+    url = reverse("admin:armor_armorupgradecost_changelist")
+    response = http_client.get(url)
+    changelist = response.context["cl"]
+    assert changelist.first_page_url is None
+    assert changelist.next_page_url is not None
+
+    response = http_client.get(url + changelist.next_page_url)
+    assert response.status_code == HTTPStatus.OK
+    changelist = response.context["cl"]
+    per_page = changelist.list_per_page
+    costs = ArmorUpgradeCost.objects.order_by("created_at", "id")
+    assert changelist.result_list == list(costs[per_page : 2 * per_page])
+    assert changelist.first_page_url == "?"
+    assert b"Next page" in response.content
+
+
+@pytest.mark.django_db()
+def test_admin_changelist_invalid_cursor(http_client: HttpTestClient) -> None:
+    admin = User.objects.create_superuser(email="admin@example.com")
+    http_client.force_login(admin)
+    url = reverse("admin:armor_armorupgradecost_changelist")
+    response = http_client.get(url, {"cursor": "not a cursor"})
+    assert response.status_code == HTTPStatus.FOUND
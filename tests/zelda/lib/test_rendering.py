@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+from jinja2 import DictLoader
+
+from django.template import base, engines
+from django.template.loader import render_to_string
+from django.templatetags.static import static
+from django.test.signals import template_rendered
+
+from zelda.lib.rendering import environment, render_timings
+
+
+def test_render_timings() -> None:
+    with render_timings() as timings:
+        render_to_string("lib/base_meta.html")
+        engines["django"].from_string("{{ value }}").render({"value": 1})
+        render_to_string("lib/base_meta.jinja")
+        engines["jinja2"].from_string("{{ value }}").render({"value": 1})
+    assert [name for name, _duration in timings] == [
+        "lib/base_meta.html",
+        "<unknown source>",
+        "lib/base_meta.jinja",
+        "<template>",
+    ]
+    assert all(duration > 0 for _name, duration in timings)
+
+
+def test_render_without_timings() -> None:
+    assert render_to_string("lib/base_meta.html")
+
+
+@pytest.mark.parametrize("instrumented", [True, False])
+def test_jinja2_template_rendered_signal(
+    monkeypatch: pytest.MonkeyPatch, instrumented: bool
+) -> None:
+    if not instrumented:
+        # as if outside of the test environment
+        monkeypatch.setattr(base.Template, "_render", base.Template.render)
+    rendered: list[str] = []
+
+    def receiver(**kwargs: Any) -> None:
+        rendered.append(kwargs["template"].origin.name)
+
+    template_rendered.connect(receiver, dispatch_uid="test")
+    try:
+        engines["jinja2"].from_string("{{ value }}").render({"value": 1})
+    finally:
+        template_rendered.disconnect(dispatch_uid="test")
+    assert len(rendered) == int(instrumented)
+
+
+def test_jinja2_environment(tmp_path: Path) -> None:
+    cache_dir = tmp_path.joinpath("jinja2")
+    source = "{{ url('armor:armor') }} {{ static('lib/js/base.js') }} {{ value }}"
+    env = environment(
+        bytecode_cache_dir=cache_dir,
+        autoescape=True,
+        loader=DictLoader({"links.jinja": source}),
+    )
+    template = env.get_template("links.jinja")
+    rendered = template.render(value="<b>")
+    assert rendered == f"/armor/ {static('lib/js/base.js')} &lt;b&gt;"
+    assert len(list(cache_dir.iterdir())) == 1
@@ -49,6 +49,13 @@ def test_hash_file() -> None:
     assert utils.hash_file(Path(os.devnull)) == dev_null_hash
 
 
+def test_hash_json() -> None:
+    assert utils.hash_json({"b": [1, 2], "a": None}) == utils.hash_json(
+        {"a": None, "b": [1, 2]}
+    )
+    assert utils.hash_json({"a": 1}) != utils.hash_json({"a": "1"})
+
+
 def test_hash_migrations() -> None:
     hashed_migrations = defaultdict(list)
     for hashed_migration in utils.hash_migrations():
@@ -0,0 +1,33 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+from zelda.lib import uuids
+from zelda.lib.date_utils import now
+
+
+def test_uuid7() -> None:
+    generated = [uuids.uuid7() for _ in range(10_000)]
+    assert generated == sorted(generated)
+    assert len(set(generated)) == len(generated)
+    assert {uuid.version for uuid in generated} == {7}
+    assert {uuid.variant for uuid in generated} == {"specified in RFC 4122"}
+
+
+def test_uuid7_is_monotonic_when_the_clock_goes_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first_uuid = uuids.uuid7()
+    monkeypatch.setattr(uuids, "time_ns", lambda: 0)
+    assert uuids.uuid7() > first_uuid
+
+
+def test_uuid7_timestamp() -> None:
+    timestamp = uuids.uuid7_timestamp(uuids.uuid7())
+    assert now() - timedelta(seconds=1) < timestamp <= now()
+
+
+def test_uuid7_timestamp_of_uuid4() -> None:
+    with pytest.raises(ValueError, match="not a version 7 UUID"):
+        uuids.uuid7_timestamp(uuid4())
@@ -0,0 +1,30 @@
+import pytest
+from pytest_django.fixtures import SettingsWrapper
+
+from django.db import connection
+
+from zelda.lib.warmup import iter_templates, warm_databases, warm_up
+
+
+def test_iter_templates() -> None:
+    names = [name for _engine, name in iter_templates()]
+    assert "armor/armor.html" in names
+    assert "lib/base_header.html" in names
+    assert names.count("admin/base_site.html") == 1
+
+
+def test_warm_up(settings: SettingsWrapper, caplog: pytest.LogCaptureFixture) -> None:
+    # warming up closes the connections, which would end the test transaction
+    settings.WARM_UP = ["zelda.lib.warmup.warm_urls", "zelda.lib.warmup.warm_templates"]
+    caplog.set_level("INFO")
+    warm_up()
+    assert [record.getMessage().split(" in ")[0] for record in caplog.records] == [
+        f"Warmed up {path}" for path in settings.WARM_UP
+    ]
+
+
+@pytest.mark.django_db()
+def test_warm_databases() -> None:
+    connection.close()
+    warm_databases()
+    assert connection.connection is not None
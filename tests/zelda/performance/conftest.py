@@ -0,0 +1,154 @@
+import json
+import os
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from statistics import median
+from time import perf_counter
+from typing import Any
+
+import pytest
+from pytest_django import DjangoDbBlocker
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from zelda.armor.models import Armor, UserArmor
+from zelda.registration.models import User
+
+BASELINES = Path(__file__).with_name("baselines.json")
+UPDATE_BASELINES = os.environ.get("UPDATE_PERFORMANCE_BASELINES") == "1"
+# wall time depends on the machine, so it is only checked on request
+CHECK_TIMINGS = os.environ.get("CHECK_PERFORMANCE_TIMINGS") == "1"
+# wall time is noisy, so only a slowdown that doubles a baseline fails
+TOLERANCE = float(os.environ.get("PERFORMANCE_TOLERANCE", "2"))
+SLACK = 0.002
+USERS = int(os.environ.get("PERFORMANCE_USERS", "1000"))
+SEED = 2017
+
+
+@dataclass(frozen=True)
+class Measurement:
+    queries: int
+    seconds: float
+
+
+@pytest.fixture(scope="package")
+def baselines() -> Iterator[dict[str, dict[str, float]]]:
+    with BASELINES.open() as file:
+        data: dict[str, dict[str, float]] = json.load(file)
+    yield data
+    if UPDATE_BASELINES:
+        with BASELINES.open("w") as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+            file.write("\n")
+
+
+def delete_seeded_users() -> None:
+    user_ids = list(
+        User.objects.filter(email__regex=r"^performance\d+@example\.com$").values_list(
+            "pk", flat=True
+        )
+    )
+    with connection.cursor() as cursor:
+        # the collector would load every level just to send its signals
+        cursor.execute(
+            "DELETE FROM armor_userarmor WHERE user_id = ANY(%s)", [user_ids]
+        )
+    User.objects.filter(pk__in=user_ids).delete()
+
+
+@pytest.fixture(scope="package")
+def seeded_users(
+    django_db_setup: None,  # noqa: ARG001
+    django_db_blocker: DjangoDbBlocker,
+) -> Iterator[list[User]]:
+    """
+    Seed thousands of users, each with a random part of the armor catalog
+
+    The data outlives the transactions of the tests, so it is deleted
+    once the whole performance suite is done, and before seeding, in case
+    an interrupted run left it behind in a reused database.
+    """
+    random = Random(SEED)  # noqa: S311
+    with django_db_blocker.unblock():
+        delete_seeded_users()
+    try:
+        with django_db_blocker.unblock():
+            armor = list(Armor.objects.order_by("id"))
+            users = User.objects.bulk_create(
+                User(email=f"performance{index}@example.com") for index in range(USERS)
+            )
+            UserArmor.objects.bulk_insert(
+                UserArmor(
+                    user=user, armor=item, level=random.randint(0, item.max_level)
+                )
+                for user in users
+                for item in random.sample(armor, random.randint(0, len(armor)))
+            )
+            with connection.cursor() as cursor:
+                # production tables have statistics, freshly seeded ones don't
+                cursor.execute("ANALYZE")
+        yield users
+    finally:
+        with django_db_blocker.unblock():
+            delete_seeded_users()
+
+
+@pytest.fixture()
+def benchmark(
+    request: pytest.FixtureRequest, baselines: dict[str, dict[str, float]]
+) -> Callable[..., Measurement]:
+    """
+    Measure a function against the baseline of the test
+
+    The function runs once to warm up and then for every round, after the
+    optional setup. The queries of the last round have to match the
+    baseline exactly. Wall time depends on the machine, so only with
+    CHECK_PERFORMANCE_TIMINGS=1 the median can't exceed the baseline by
+    more than the tolerance, and otherwise a single round is run. With
+    UPDATE_PERFORMANCE_BASELINES=1, the measurements replace the baselines
+    instead.
+    """
+
+    def measure(
+        func: Callable[[], Any],
+        *,
+        rounds: int = 10,
+        setup: Callable[[], Any] | None = None,
+    ) -> Measurement:
+        if not CHECK_TIMINGS and not UPDATE_BASELINES:
+            rounds = 1
+        timings = []
+        for _ in range(rounds + 1):
+            if setup is not None:
+                setup()
+            with CaptureQueriesContext(connection) as context:
+                start = perf_counter()
+                func()
+                timings.append(perf_counter() - start)
+        measurement = Measurement(
+            queries=len(context.captured_queries), seconds=median(timings[1:])
+        )
+
+        name = request.node.name
+        if UPDATE_BASELINES:
+            baselines[name] = {
+                "queries": measurement.queries,
+                "seconds": round(measurement.seconds, 6),
+            }
+            return measurement
+
+        baseline = baselines.get(name)
+        assert baseline is not None, f"No baseline for {name}"
+        assert measurement.queries == baseline["queries"]
+        if not CHECK_TIMINGS:
+            return measurement
+        assert measurement.seconds <= baseline["seconds"] * TOLERANCE + SLACK, (
+            f"{name} took {measurement.seconds:.6f}s, "
+            f"the baseline is {baseline['seconds']:.6f}s"
+        )
+        return measurement
+
+    return measure
@@ -0,0 +1,68 @@
+from collections.abc import Callable
+from functools import partial
+
+import pytest
+
+from django.urls import reverse
+
+from zelda.armor.catalog import get_catalog
+from zelda.armor.models import Armor, UserArmor
+from zelda.armor.versions import bump_progress_version
+from zelda.registration.models import User
+
+from tests.conftest import HttpTestClient
+from tests.zelda.performance.conftest import Measurement
+
+
+@pytest.fixture()
+def user(seeded_users: list[User], http_client: HttpTestClient) -> User:
+    user = seeded_users[len(seeded_users) // 2]
+    http_client.force_login(user)
+    get_catalog()
+    return user
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("cached", [False, True])
+def test_armor_view(
+    benchmark: Callable[..., Measurement],
+    http_client: HttpTestClient,
+    user: User,
+    cached: bool,
+) -> None:
+    url = reverse("armor:armor")
+    benchmark(
+        lambda: http_client.get(url),
+        setup=None if cached else partial(bump_progress_version, user.pk),
+    )
+
+
+@pytest.mark.django_db()
+def test_armor_progress_view(
+    benchmark: Callable[..., Measurement],
+    http_client: HttpTestClient,
+    user: User,  # noqa: ARG001
+) -> None:
+    url = reverse("armor:progress")
+    benchmark(lambda: http_client.get(url))
+
+
+@pytest.mark.django_db()
+def test_update_armor_view(
+    benchmark: Callable[..., Measurement],
+    http_client: HttpTestClient,
+    user: User,
+) -> None:
+    armor = list(Armor.objects.order_by("id"))
+    levels = [UserArmor(user=user, armor=item, level=0) for item in armor[::2]]
+    data = {item.name: str(item.max_level) for item in armor[::3]}
+
+    def reset_levels() -> None:
+        user.armor_levels.all().delete()
+        UserArmor.objects.bulk_create(
+            UserArmor(user=user, armor=level.armor, level=level.level)
+            for level in levels
+        )
+
+    url = reverse("armor:update-armor")
+    benchmark(lambda: http_client.post(url, data), setup=reset_levels)
@@ -0,0 +1,31 @@
+from collections.abc import Callable
+
+import pytest
+
+from zelda.lib.choices import Item
+from zelda.lib.date_utils import now
+
+from tests.zelda.performance.conftest import Measurement
+
+CALLS = 10_000
+
+
+@pytest.mark.django_db()
+def test_choices_lookups(benchmark: Callable[..., Measurement]) -> None:
+    keys = Item.keys()
+
+    def look_up() -> None:
+        for _ in range(CALLS // len(keys)):
+            for key in keys:
+                Item.index_of(Item.key_for(Item.label_for(key)))
+
+    benchmark(look_up)
+
+
+@pytest.mark.django_db()
+def test_now(benchmark: Callable[..., Measurement]) -> None:
+    def call_now() -> None:
+        for _ in range(CALLS):
+            now()
+
+    benchmark(call_now)
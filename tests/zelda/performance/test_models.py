@@ -0,0 +1,51 @@
+from collections.abc import Callable
+from typing import Literal
+
+import pytest
+
+from zelda.armor.models import Armor, UserArmor
+from zelda.registration.models import User
+
+from tests.zelda.performance.conftest import Measurement
+
+ROWS = 2000
+
+
+@pytest.mark.django_db()
+def test_bulk_insert(
+    benchmark: Callable[..., Measurement], seeded_users: list[User]
+) -> None:
+    users = seeded_users[:10]
+    armor = list(Armor.objects.all())
+
+    def delete_levels() -> None:
+        UserArmor.objects.filter(user__in=users).delete()
+
+    def insert_levels() -> None:
+        UserArmor.objects.bulk_insert(
+            UserArmor(user=user, armor=item, level=0)
+            for user in users
+            for item in armor
+        )
+
+    benchmark(insert_levels, rounds=3, setup=delete_levels)
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("strategy", ["case", "values"])
+def test_bulk_update(
+    benchmark: Callable[..., Measurement],
+    seeded_users: list[User],  # noqa: ARG001
+    strategy: Literal["case", "values"],
+) -> None:
+    levels = list(UserArmor.objects.order_by("id")[:ROWS])
+
+    def reset_levels() -> None:
+        for level in levels:
+            level.level = 0
+
+    benchmark(
+        lambda: UserArmor.objects.bulk_update(levels, ["level"], strategy=strategy),
+        rounds=3,
+        setup=reset_levels,
+    )